@@ -0,0 +1,237 @@
+"""
+Проверка планов запросов списков заказов через EXPLAIN.
+
+Для каждого поддерживаемого фильтра строит тот же запрос, что и
+GET /orders/ (первая и следующая страницы), разбирает EXPLAIN (FORMAT JSON)
+и проверяет, что каждая непустая партиция orders читается ожидаемым для
+фильтра индексом (индексы партиций сопоставляются с индексами orders через
+pg_inherits), без Seq Scan и без узла Sort: порядок (created_at, id) должен
+давать индекс. Sort допускается только там, где он указан в ожиданиях
+(диапазон цены). Для пустых партиций план не важен. Данные для статистики
+планировщика (--rows заказов --users пользователей) создаются внутри
+транзакции, которая в конце откатывается. На малых объёмах планировщик
+выбирает bitmap-скан с сортировкой, поэтому по умолчанию у каждого
+пользователя 10000 заказов. Код выхода 1, если хотя бы один
+план не совпал с ожиданиями. Требуется Postgres со схемой сервиса api.
+
+Запуск: python -m benchmarks.explain_orders --rows 200000 --users 20
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from benchmarks.report import emit
+from database.connection import async_session_maker, engine
+from database.query import _orders_stmt
+from helpers.enums import OrderStatus
+from schemas.orders import OrdersListFilter
+
+BENCH_EMAIL = "bench-explain@example.com"
+
+
+# Ожидания по сочетаниям: допустимые индексы orders и допустим ли Sort.
+# Диапазон цены не совпадает с порядком страниц: планировщик либо выбирает
+# строки по ix_orders_total_price и сортирует их, либо идёт по
+# ix_orders_created_at_id с фильтром, в зависимости от объёма.
+EXPECTED = {
+    "no_filter": ({"ix_orders_created_at_id"}, False),
+    "user": ({"ix_orders_users_id_created_at_id"}, False),
+    "status": ({"ix_orders_status_created_at_id"}, False),
+    "status_pending": ({"ix_orders_pending_created_at_id"}, False),
+    "created_range": ({"ix_orders_created_at_id"}, False),
+    "price_range": ({"ix_orders_total_price", "ix_orders_created_at_id"}, True),
+    "user_status": ({"ix_orders_users_id_created_at_id"}, False),
+    "user_created_range": ({"ix_orders_users_id_created_at_id"}, False),
+}
+
+
+def cases(user_id: UUID, now: datetime) -> dict[str, tuple]:
+    """Проверяемые сочетания (пользователь, фильтр)."""
+    week_ago = now - timedelta(days=7)
+    return {
+        "no_filter": (None, None),
+        "user": (user_id, None),
+        "status": (None, OrdersListFilter(status=OrderStatus.PAID)),
+        "status_pending": (None, OrdersListFilter(status=OrderStatus.PENDING)),
+        "created_range": (
+            None,
+            OrdersListFilter(created_from=week_ago, created_to=now),
+        ),
+        "price_range": (
+            None,
+            OrdersListFilter(
+                min_total_price=Decimal("9900"), max_total_price=Decimal("10000")
+            ),
+        ),
+        "user_status": (user_id, OrdersListFilter(status=OrderStatus.SHIPPED)),
+        "user_created_range": (
+            user_id,
+            OrdersListFilter(created_from=week_ago, created_to=now),
+        ),
+    }
+
+
+def plan_nodes(plan: dict) -> list[dict]:
+    """Все узлы плана в порядке обхода."""
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def explain(session, stmt) -> list[dict]:
+    """EXPLAIN (FORMAT JSON) запроса с подставленными значениями."""
+    sql = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    return plan_nodes(result.scalar()[0]["Plan"])
+
+
+async def seed(session, rows: int, users: int) -> UUID:
+    """
+    Создание users служебных пользователей и rows заказов за последние
+    90 дней, распределённых между ними поровну.
+
+    Returns:
+        UUID: Пользователь, заказы которого проверяются
+    """
+    user_ids = list(
+        await session.scalars(
+            text(
+                "INSERT INTO users (email, password_hash) "
+                "SELECT n || '-' || :email, '-' "
+                "FROM generate_series(1, CAST(:users AS integer)) AS n "
+                "RETURNING id"
+            ),
+            {"email": BENCH_EMAIL, "users": users},
+        )
+    )
+    await session.execute(
+        text(
+            "INSERT INTO orders (users_id, items, total_price, status, created_at) "
+            "SELECT (CAST(:user_ids AS uuid[]))[n % CAST(:users AS integer) + 1], "
+            "'[]'::jsonb, (n % 10000) + 0.99, "
+            "(ARRAY['PENDING', 'PAID', 'SHIPPED', 'CANCELED'])[n / 7 % 4 + 1]"
+            "::orderstatus, "
+            "now() - make_interval(secs => n * 7776000.0 / CAST(:rows AS integer)) "
+            "FROM generate_series(1, CAST(:rows AS integer)) AS n"
+        ),
+        {"user_ids": user_ids, "users": users, "rows": rows},
+    )
+    await session.execute(text("ANALYZE orders"))
+    return user_ids[0]
+
+
+async def filled_partitions(session) -> set[str]:
+    """Названия партиций orders, в которых есть строки."""
+    result = await session.scalars(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'orders' AND child.reltuples > 0"
+        )
+    )
+    return set(result)
+
+
+async def partition_indexes(session) -> dict[str, tuple[str, str]]:
+    """Индексы партиций orders: (индекс orders, партиция) по названию."""
+    result = await session.execute(
+        text(
+            "SELECT child.relname, parent.relname, partition.relname "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_index ON pg_index.indexrelid = child.oid "
+            "JOIN pg_class partition ON partition.oid = pg_index.indrelid "
+            "JOIN pg_index parent_index ON parent_index.indexrelid = parent.oid "
+            "JOIN pg_class orders ON orders.oid = parent_index.indrelid "
+            "WHERE orders.relname = 'orders'"
+        )
+    )
+    return {index: (parent, partition) for index, parent, partition in result}
+
+
+def check_plan(
+    nodes: list[dict],
+    filled: set[str],
+    indexes: dict[str, tuple[str, str]],
+    expected: tuple[set[str], bool],
+) -> list[str]:
+    """
+    Функция сверки плана с ожиданиями.
+
+    Returns:
+        list[str]: Описания расхождений, пустой список - план подходит
+    """
+    allowed, sort_allowed = expected
+    problems = []
+    for node in nodes:
+        node_type = node["Node Type"]
+        if node_type == "Sort" and not sort_allowed:
+            problems.append(f"Sort by {node.get('Sort Key')}")
+        if node_type == "Seq Scan" and node.get("Relation Name") in filled:
+            problems.append(f"Seq Scan on {node['Relation Name']}")
+        if "Index Name" not in node:
+            continue
+        parent, partition = indexes.get(node["Index Name"], (node["Index Name"], ""))
+        if partition in filled and parent not in allowed:
+            problems.append(f"{parent} on {partition}")
+    return problems
+
+
+async def main(args: argparse.Namespace) -> int:
+    results = {}
+    try:
+        async with async_session_maker() as session:
+            user_id = await seed(session, args.rows, args.users)
+            filled = await filled_partitions(session)
+            indexes = await partition_indexes(session)
+            now = datetime.now(timezone.utc)
+            for name, (case_user, filters) in cases(user_id, now).items():
+                for page, after in (("first", None), ("next", (now, UUID(int=0)))):
+                    stmt = _orders_stmt(case_user, after, filters)
+                    nodes = await explain(session, stmt.limit(args.limit + 1))
+                    problems = check_plan(nodes, filled, indexes, EXPECTED[name])
+                    results[f"{name}:{page}"] = {
+                        "ok": not problems,
+                        "problems": problems,
+                        "partitions": sorted(
+                            {
+                                node["Relation Name"]
+                                for node in nodes
+                                if "Relation Name" in node
+                            }
+                        ),
+                        "indexes": sorted(
+                            {
+                                indexes.get(index, (index,))[0]
+                                for index in (node.get("Index Name") for node in nodes)
+                                if index
+                            }
+                        ),
+                        "nodes": [node["Node Type"] for node in nodes],
+                    }
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+    emit("explain_orders", vars(args), results)
+    return 0 if all(result["ok"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,79 @@
+"""
+Бенчмарк влияния bcrypt на остальные запросы.
+
+Пока login_concurrency задач непрерывно проверяют пароли (нагрузка /token/),
+лёгкие "чтения" каждые --probe-interval мс засекают, насколько позже срока
+их разбудил event loop. Это та задержка, которую получают чтения /orders/.
+Режим sync вызывает verify_password прямо в loop (как до переноса в пул),
+режим pool использует verify_password_async.
+
+Запуск: python -m benchmarks.hashing_stall --seconds 5 --login-concurrency 8
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.report import emit, per_second, percentiles
+from helpers.hashers import (
+    get_password_hash,
+    shutdown_executor,
+    verify_password,
+    verify_password_async,
+)
+
+
+async def login_load(mode: str, hashed: str, stop: asyncio.Event) -> int:
+    """Цикл проверок пароля до сигнала остановки."""
+    done = 0
+    while not stop.is_set():
+        if mode == "sync":
+            verify_password("password", hashed)
+            await asyncio.sleep(0)
+        else:
+            await verify_password_async("password", hashed)
+        done += 1
+    return done
+
+
+async def probe_reads(interval: float, stop: asyncio.Event) -> list[float]:
+    """Замер опоздания лёгких задач относительно запланированного времени."""
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+    return lags
+
+
+async def run(mode: str, args: argparse.Namespace, hashed: str) -> dict:
+    stop = asyncio.Event()
+    logins = [
+        asyncio.create_task(login_load(mode, hashed, stop))
+        for _ in range(args.login_concurrency)
+    ]
+    probe = asyncio.create_task(probe_reads(args.probe_interval / 1000, stop))
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    verified = sum(await asyncio.gather(*logins))
+    return {
+        "verifications_per_sec": per_second(verified, args.seconds),
+        "read_lag_ms": percentiles(await probe),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    hashed = get_password_hash("password")
+    results = {}
+    for mode in ("sync", "pool"):
+        results[mode] = await run(mode, args, hashed)
+    shutdown_executor()
+    emit("hashing_stall", vars(args), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--login-concurrency", type=int, default=8)
+    parser.add_argument("--probe-interval", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
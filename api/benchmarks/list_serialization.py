@@ -0,0 +1,122 @@
+"""
+Бенчмарк сериализации списков заказов.
+
+Страница из --sizes заказов отдаётся приложением FastAPI в одном процессе
+(httpx.ASGITransport), замеряется процессорное время на запрос.
+Режимы:
+- legacy: ORM объекты в OrdersPage, валидация response_model,
+  jsonable-кодирование и JSONResponse (как до перехода);
+- legacy_orjson: то же с default_response_class=ORJSONResponse;
+- dump_json_orm: ORM объекты, один проход Orders.dump_json;
+- dump_json_rows: кортежи колонок ORDER_COLUMNS (как теперь отдаёт
+  get_orders), один проход Orders.dump_json.
+
+Заказы строятся в памяти, загрузка из БД и создание ORM объектов
+в замер не входят. identical - совпадает ли тело ответа с legacy байт
+в байт. Нужна группа зависимостей bench (httpx).
+
+Запуск: python -m benchmarks.list_serialization --sizes 1000,100000
+"""
+
+import argparse
+import asyncio
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from benchmarks.report import emit
+from database.query import ORDER_COLUMNS
+from helpers.enums import OrderStatus
+from models.orders import Orders as SqlOrders
+from routers.orders import orders_page_json
+from schemas.orders import OrdersPage
+
+MODES = ("legacy", "legacy_orjson", "dump_json_orm", "dump_json_rows")
+OrderRow = namedtuple("OrderRow", [column.key for column in ORDER_COLUMNS])
+
+
+def make_orders(size: int) -> tuple[list[SqlOrders], list[OrderRow]]:
+    """Одинаковые заказы ORM объектами и кортежами колонок."""
+    now = datetime.now(timezone.utc)
+    statuses = list(OrderStatus)
+    rows = [
+        OrderRow(
+            id=uuid4(),
+            items=["book", {"sku": f"pen-{i}", "qty": i % 5 + 1}],
+            total_price=Decimal(f"{i % 100000}.{i % 100:02d}"),
+            status=statuses[i % len(statuses)],
+            created_at=now - timedelta(seconds=i),
+        )
+        for i in range(size)
+    ]
+    orm = [SqlOrders(users_id=uuid4(), **row._asdict()) for row in rows]
+    return orm, rows
+
+
+def make_app(mode: str, orm: list[SqlOrders], rows: list[OrderRow]) -> FastAPI:
+    """Приложение с одним списком заказов, отдаваемым в режиме mode."""
+    response_class = ORJSONResponse if mode == "legacy_orjson" else JSONResponse
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/orders/", response_model=OrdersPage)
+    async def get_orders():
+        if mode in ("legacy", "legacy_orjson"):
+            return OrdersPage(items=orm, next_cursor=None)
+        orders = orm if mode == "dump_json_orm" else rows
+        return Response(
+            content=orders_page_json(orders, None), media_type="application/json"
+        )
+
+    return app
+
+
+async def run(mode: str, args: argparse.Namespace, orm, rows) -> tuple[dict, bytes]:
+    transport = httpx.ASGITransport(app=make_app(mode, orm, rows))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        timings = []
+        for _ in range(args.rounds):
+            started = time.process_time()
+            response = await client.get("/orders/")
+            timings.append(time.process_time() - started)
+        response.raise_for_status()
+    return {
+        "cpu_ms": round(min(timings) * 1000, 3),
+        "bytes": len(response.content),
+    }, response.content
+
+
+async def main(args: argparse.Namespace) -> None:
+    results = {}
+    for size in args.sizes:
+        orm, rows = make_orders(size)
+        results[str(size)] = by_mode = {}
+        legacy_body = None
+        for mode in MODES:
+            by_mode[mode], body = await run(mode, args, orm, rows)
+            if mode == "legacy":
+                legacy_body = body
+            by_mode[mode]["identical"] = body == legacy_body
+        baseline = by_mode["legacy"]["cpu_ms"]
+        for measured in by_mode.values():
+            # process_time на маленьких страницах может дать 0
+            measured["speedup"] = (
+                round(baseline / measured["cpu_ms"], 2) if measured["cpu_ms"] else None
+            )
+    emit("list_serialization", vars(args), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[1000, 100000],
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
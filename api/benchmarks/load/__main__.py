@@ -0,0 +1,146 @@
+"""
+Нагрузочный прогон API в одном процессе.
+
+Приложение FastAPI запускается со своим lifespan и получает запросы через
+httpx.ASGITransport, без сети и без docker-compose. Внешние сервисы
+подменяются локальными заменами (см. benchmarks.load.standins), каждую можно
+заменить настоящим сервисом из настроек:
+--redis fake|real, --rmq memory|real, --postgres ephemeral|existing.
+В режиме existing данные прогона остаются в базе.
+
+Сценарии: register, token, create, get_miss, get_hit, list, patch.
+Для каждого выводятся p50/p95/p99 задержки, запросы в секунду и коды ответов.
+Лимиты запросов поднимаются, чтобы не ограничивать нагрузку, но проверка
+лимита остаётся в пути запроса.
+
+Запуск: python -m benchmarks.load --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.load.scenarios import SCENARIOS, BenchContext, Request
+from benchmarks.load.standins import (
+    EphemeralPostgres,
+    MemoryRMQ,
+    install_fake_redis,
+)
+from benchmarks.report import emit, per_second, percentiles
+from redis_core.rate_limiter import LocalTokenBucket, RateLimiter
+
+# Сценарии с bcrypt: на порядки медленнее остальных, свой размер прогона
+AUTH_SCENARIOS = {"register", "token"}
+UNLIMITED = 10**9
+
+
+def raise_rate_limits(app: FastAPI) -> None:
+    """Поднятие лимитов всех RateLimiter роутов приложения."""
+    for route in app.routes:
+        for dependency in getattr(route, "dependencies", []):
+            limiter = dependency.dependency
+            if isinstance(limiter, RateLimiter):
+                limiter.limit = UNLIMITED
+                limiter.local_bucket = LocalTokenBucket(
+                    UNLIMITED, limiter.duration_in_second, 1
+                )
+
+
+async def run_scenario(
+    ctx: BenchContext, request: Request, count: int, concurrency: int
+) -> dict:
+    """Прогон count запросов сценария concurrency параллельными клиентами."""
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    numbers = iter(range(count))
+
+    async def client() -> None:
+        for i in numbers:
+            started = time.perf_counter()
+            response = await request(ctx, i)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": count,
+        "seconds": round(elapsed, 4),
+        "requests_per_sec": per_second(count, elapsed),
+        "latency_ms": percentiles(latencies),
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    postgres = EphemeralPostgres() if args.postgres == "ephemeral" else None
+    if postgres is not None:
+        await postgres.create()
+
+    # Модули сервиса импортируются после выбора базы: движок создаётся при импорте
+    from database.connection import engine
+    from main import app
+    from rabbit_core.client import rmq_client
+    from redis_core.client import redis_client
+
+    if args.redis == "fake":
+        install_fake_redis(redis_client)
+    rmq = MemoryRMQ() if args.rmq == "memory" else None
+    if rmq is not None:
+        rmq.install(rmq_client)
+    raise_rate_limits(app)
+
+    results = {}
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                ctx = BenchContext(client)
+                await ctx.login()
+                for name in args.scenarios:
+                    prepare, request = SCENARIOS[name]
+                    count = (
+                        args.auth_requests if name in AUTH_SCENARIOS else args.requests
+                    )
+                    await prepare(ctx, count)
+                    results[name] = await run_scenario(
+                        ctx, request, count, args.concurrency
+                    )
+    finally:
+        await engine.dispose()
+        if postgres is not None:
+            await postgres.drop()
+
+    if rmq is not None:
+        results["published_events"] = len(rmq.messages)
+    emit("load", vars(args), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--auth-requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help=f"Через запятую из: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--redis", choices=["fake", "real"], default="fake")
+    parser.add_argument("--rmq", choices=["memory", "real"], default="memory")
+    parser.add_argument(
+        "--postgres", choices=["ephemeral", "existing"], default="ephemeral"
+    )
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Неизвестные сценарии: {', '.join(sorted(unknown))}")
+    asyncio.run(main(args))
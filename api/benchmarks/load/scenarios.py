@@ -0,0 +1,128 @@
+"""
+Сценарии нагрузочного прогона.
+
+Каждый сценарий - подготовка (prepare) и один запрос (request) с номером i.
+Подготовка выполняется до замера и создаёт нужные сценарию данные через
+то же API.
+"""
+
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+import httpx
+
+from helpers.enums import OrderStatus
+
+ORDER = {"items": ["book", "pen"], "total_price": "1000.00", "status": "PENDING"}
+PASSWORD = "bench-password"
+BULK_SIZE = 1000
+# Заказов в наборе для попаданий в кэш и смены статуса
+HOT_ORDERS = 100
+
+
+class BenchContext:
+    """Состояние прогона: клиент, пользователь и подготовленные заказы."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.run_id = uuid4().hex[:8]
+        self.email = f"bench-{self.run_id}@example.com"
+        self.headers: dict[str, str] = {}
+        self.order_ids: list[str] = []
+
+    async def login(self) -> None:
+        """Метод регистрации пользователя прогона и получения токена."""
+        credentials = {"email": self.email, "password": PASSWORD}
+        response = await self.client.post("/register/", json=credentials)
+        response.raise_for_status()
+        response = await self.client.post("/token/", json=credentials)
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def create_orders(self, count: int) -> list[str]:
+        """Метод создания count заказов пачками через POST /orders/bulk/."""
+        ids = []
+        for start in range(0, count, BULK_SIZE):
+            size = min(BULK_SIZE, count - start)
+            response = await self.client.post(
+                "/orders/bulk/", json=[ORDER] * size, headers=self.headers
+            )
+            response.raise_for_status()
+            ids.extend(item["order"]["id"] for item in response.json()["items"])
+        return ids
+
+
+Prepare = Callable[[BenchContext, int], Awaitable[None]]
+Request = Callable[[BenchContext, int], Awaitable[httpx.Response]]
+
+
+async def no_prepare(ctx: BenchContext, count: int) -> None:
+    return None
+
+
+async def register(ctx: BenchContext, i: int) -> httpx.Response:
+    return await ctx.client.post(
+        "/register/",
+        json={"email": f"bench-{ctx.run_id}-{i}@example.com", "password": PASSWORD},
+    )
+
+
+async def token(ctx: BenchContext, i: int) -> httpx.Response:
+    return await ctx.client.post(
+        "/token/", json={"email": ctx.email, "password": PASSWORD}
+    )
+
+
+async def create(ctx: BenchContext, i: int) -> httpx.Response:
+    return await ctx.client.post("/orders/", json=ORDER, headers=ctx.headers)
+
+
+async def prepare_miss(ctx: BenchContext, count: int) -> None:
+    """Заказы, которые ещё ни разу не читались: каждый запрос - промах кэша."""
+    ctx.order_ids = await ctx.create_orders(count)
+
+
+async def prepare_hit(ctx: BenchContext, count: int) -> None:
+    """Небольшой набор заказов, прочитанных заранее: запросы попадают в кэш."""
+    ctx.order_ids = await ctx.create_orders(HOT_ORDERS)
+    for order_id in ctx.order_ids:
+        response = await ctx.client.get(f"/orders/{order_id}/", headers=ctx.headers)
+        response.raise_for_status()
+
+
+async def get_order(ctx: BenchContext, i: int) -> httpx.Response:
+    order_id = ctx.order_ids[i % len(ctx.order_ids)]
+    return await ctx.client.get(f"/orders/{order_id}/", headers=ctx.headers)
+
+
+async def prepare_list(ctx: BenchContext, count: int) -> None:
+    """Минимум одна полная страница заказов."""
+    await ctx.create_orders(BULK_SIZE)
+
+
+async def list_orders(ctx: BenchContext, i: int) -> httpx.Response:
+    return await ctx.client.get("/orders/", params={"limit": 50}, headers=ctx.headers)
+
+
+async def prepare_patch(ctx: BenchContext, count: int) -> None:
+    ctx.order_ids = await ctx.create_orders(HOT_ORDERS)
+
+
+async def patch(ctx: BenchContext, i: int) -> httpx.Response:
+    order_id = ctx.order_ids[i % len(ctx.order_ids)]
+    status = OrderStatus.PAID if i // len(ctx.order_ids) % 2 else OrderStatus.SHIPPED
+    return await ctx.client.patch(
+        f"/orders/{order_id}/", json={"status": status}, headers=ctx.headers
+    )
+
+
+# Название -> (подготовка, запрос); порядок - порядок прогона по умолчанию
+SCENARIOS: dict[str, tuple[Prepare, Request]] = {
+    "register": (no_prepare, register),
+    "token": (no_prepare, token),
+    "create": (no_prepare, create),
+    "get_miss": (prepare_miss, get_order),
+    "get_hit": (prepare_hit, get_order),
+    "list": (prepare_list, list_orders),
+    "patch": (prepare_patch, patch),
+}
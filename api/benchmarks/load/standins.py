@@ -0,0 +1,134 @@
+"""
+Локальные замены внешних сервисов для нагрузочного прогона.
+
+- Redis: fakeredis в памяти процесса (с Lua, поэтому лимитер и блокировки
+  кэша работают как с настоящим Redis);
+- RabbitMQ: сообщения остаются в памяти процесса, публикация подтверждается
+  сразу;
+- Postgres: временная база на локальном сервере с миграциями alembic,
+  удаляется после прогона. Запросы сервиса используют JSONB, ON CONFLICT,
+  партиции и блокировки строк, поэтому заменить Postgres в памяти нельзя.
+
+Замены Redis и RabbitMQ подменяют методы общих клиентов redis_client
+и rmq_client, поэтому их нужно ставить до запуска lifespan приложения.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import asyncpg
+from alembic import command
+from alembic.config import Config
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from configs import settings
+from rabbit_core.client import RMQClient
+from redis_core.client import RedisClient
+
+
+def install_fake_redis(client: RedisClient) -> FakeServer:
+    """
+    Функция подмены подключения RedisClient на fakeredis.
+
+    Args:
+        client (RedisClient): Клиент Redis сервиса
+
+    Returns:
+        FakeServer: Общее состояние, которое видят все соединения клиента
+    """
+    server = FakeServer()
+
+    async def connect(redis_url: str) -> bool:
+        client.redis = FakeRedis(server=server)
+        client.pool = client.redis.connection_pool
+        return True
+
+    client.connect = connect
+    return server
+
+
+class MemoryRMQ:
+    """Замена RabbitMQ: опубликованные сообщения копятся в памяти процесса."""
+
+    def __init__(self):
+        self.messages: list[dict] = []
+
+    def install(self, client: RMQClient) -> None:
+        """
+        Метод подмены подключения и публикации RMQClient.
+
+        Args:
+            client (RMQClient): Клиент RMQ сервиса
+        """
+        client.connect = self.connect
+        client.enable_batching = self.enable_batching
+        client.send_message = self.send_message
+        client.disconnect = self.disconnect
+
+    async def connect(self, *args, **kwargs) -> None:
+        return None
+
+    def enable_batching(self, *args, **kwargs) -> None:
+        return None
+
+    async def send_message(
+        self,
+        exchange_name: str,
+        queue_name: str,
+        message: str,
+        task_name: str,
+        trace_context: dict[str, str] | None = None,
+    ) -> None:
+        self.messages.append(
+            {
+                "exchange": exchange_name,
+                "routing_key": queue_name,
+                "task_name": task_name,
+                "body": message,
+            }
+        )
+
+    async def disconnect(self) -> None:
+        return None
+
+
+class EphemeralPostgres:
+    """
+    Временная база данных на сервере из настроек POSTGRES_*.
+    Пользователю нужно право CREATEDB.
+    """
+
+    def __init__(self):
+        self.name = f"orders_bench_{uuid4().hex[:8]}"
+        self.original = settings.POSTGRES_DB
+
+    async def _execute(self, query: str) -> None:
+        """Метод выполнения команды в служебной базе postgres."""
+        connection = await asyncpg.connect(
+            host=settings.POSTGRES_HOST,
+            port=settings.POSTGRES_PORT,
+            user=settings.POSTGRES_USER,
+            password=settings.POSTGRES_PASSWORD,
+            database="postgres",
+        )
+        try:
+            await connection.execute(query)
+        finally:
+            await connection.close()
+
+    async def create(self) -> None:
+        """
+        Метод создания базы и применения миграций.
+        Вызывается до импорта database.connection: движок сервиса создаётся
+        при импорте по settings.POSTGRES_DB.
+        """
+        await self._execute(f'CREATE DATABASE "{self.name}"')
+        settings.POSTGRES_DB = self.name
+        # env.py alembic сам запускает event loop, поэтому в отдельном потоке
+        await asyncio.to_thread(command.upgrade, Config("alembic.ini"), "head")
+
+    async def drop(self) -> None:
+        """Метод удаления базы после закрытия пулов соединений сервиса."""
+        settings.POSTGRES_DB = self.original
+        await self._execute(f'DROP DATABASE IF EXISTS "{self.name}" WITH (FORCE)')
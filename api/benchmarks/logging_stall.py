@@ -0,0 +1,171 @@
+"""
+Бенчмарк влияния логирования на event loop.
+
+log_concurrency задач пишут INFO записи горячего пути (как
+RedisClient.check_cache) по --rate записей в секунду каждая (0 - без пауз),
+а лёгкие "чтения" каждые --probe-interval мс засекают, насколько позже
+срока их разбудил event loop. --write-delay-us добавляет задержку к каждой
+записи в файл и эмулирует медленный диск (сетевой том, заполненный кэш
+страниц).
+Режимы:
+- sync: обработчики файла и консоли прямо на корневом логгере (как до
+  перехода на очередь), запись на диск в потоке event loop;
+- queue: init_logger, запись в отдельном потоке QueueListener;
+- queue_json: то же с LOG_FORMAT=json;
+- queue_sampled: то же с долей записей --sample-rate для логгера бенчмарка.
+
+Для режимов с очередью drain_seconds - время вывода накопленной очереди
+при остановке. Консоль направляется в /dev/null, файлы пишутся во
+временный каталог.
+
+Запуск: python -m benchmarks.logging_stall --seconds 5 --write-delay-us 200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import logging.handlers
+import os
+import tempfile
+import time
+
+from benchmarks.report import emit, per_second, percentiles
+from configs import settings
+from helpers.logger import (
+    ColoredFormatter,
+    console_msg_format,
+    file_msg_format,
+    init_logger,
+    stop_logger,
+)
+
+MODES = ("sync", "queue", "queue_json", "queue_sampled")
+LOGGER_NAME = "benchmarks.hot_path"
+logger = logging.getLogger(LOGGER_NAME)
+
+
+class SlowDisk(logging.Filter):
+    """Задержка каждой записи в файл в потоке, который её пишет."""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.delay:
+            time.sleep(self.delay)
+        return True
+
+
+def init_sync_logger(init_dir: str, console) -> list[logging.Handler]:
+    """Прежняя схема: синхронные обработчики на корневом логгере."""
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(init_dir, "sync.log"), maxBytes=1024**2, backupCount=100
+    )
+    file_handler.setFormatter(logging.Formatter(file_msg_format))
+    stream_handler = logging.StreamHandler(console)
+    stream_handler.setLevel(logging.INFO)
+    stream_handler.setFormatter(ColoredFormatter(console_msg_format))
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    root.addHandler(file_handler)
+    root.addHandler(stream_handler)
+    return [file_handler, stream_handler]
+
+
+async def log_load(interval: float, stop: asyncio.Event, calls: list[float]) -> int:
+    """Цикл записей в лог до сигнала остановки."""
+    done = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        logger.info("Key %s found in cache", f"order:{done}")
+        calls.append(time.perf_counter() - started)
+        done += 1
+        await asyncio.sleep(interval)
+    return done
+
+
+async def probe_reads(interval: float, stop: asyncio.Event) -> list[float]:
+    """Замер опоздания лёгких задач относительно запланированного времени."""
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+    return lags
+
+
+async def run(mode: str, args: argparse.Namespace, init_dir: str, console) -> dict:
+    if mode == "sync":
+        handlers = init_sync_logger(init_dir, console)
+    else:
+        settings.LOG_FORMAT = "json" if mode == "queue_json" else "text"
+        settings.LOG_SAMPLE_RATES = (
+            f"{LOGGER_NAME}={args.sample_rate}" if mode == "queue_sampled" else ""
+        )
+        with contextlib.redirect_stderr(console):
+            handlers = init_logger(init_dir=os.path.join(init_dir, mode)).handlers
+    # Первый обработчик в обеих схемах - файловый
+    handlers[0].addFilter(SlowDisk(args.write_delay_us / 1_000_000))
+
+    stop = asyncio.Event()
+    calls: list[float] = []
+    interval = 1 / args.rate if args.rate else 0
+    writers = [
+        asyncio.create_task(log_load(interval, stop, calls))
+        for _ in range(args.log_concurrency)
+    ]
+    probe = asyncio.create_task(probe_reads(args.probe_interval / 1000, stop))
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    written = sum(await asyncio.gather(*writers))
+    lags = await probe
+
+    started = time.perf_counter()
+    if mode == "sync":
+        for handler in handlers:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+    else:
+        stop_logger()
+    result = {
+        "logs_per_sec": per_second(written, args.seconds),
+        "call_us": percentiles(calls, scale=1_000_000),
+        "read_lag_ms": percentiles(lags),
+    }
+    if mode != "sync":
+        result["drain_seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+async def main(args: argparse.Namespace) -> None:
+    results = {}
+    with (
+        tempfile.TemporaryDirectory() as init_dir,
+        open(os.devnull, "w") as console,
+    ):
+        for mode in args.modes:
+            results[mode] = await run(mode, args, init_dir, console)
+    emit("logging_stall", vars(args), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--log-concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=500.0)
+    parser.add_argument("--write-delay-us", type=float, default=0.0)
+    parser.add_argument("--probe-interval", type=float, default=1.0)
+    parser.add_argument("--sample-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--modes",
+        type=lambda value: value.split(","),
+        default=list(MODES),
+        help=f"Через запятую из: {', '.join(MODES)}",
+    )
+    args = parser.parse_args()
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f"Неизвестные режимы: {', '.join(sorted(unknown))}")
+    asyncio.run(main(args))
@@ -0,0 +1,148 @@
+"""
+Бенчмарк накладных расходов метрик Prometheus.
+
+Сравнивает в одном процессе:
+- вызов корутины без декоратора и с @timed (таймеры Redis, RMQ);
+- инкремент счётчика кэша;
+- ASGI запрос к минимальному приложению FastAPI без MetricsMiddleware и с ним.
+
+Каждый вариант прогоняется --rounds раз, берётся лучший прогон, чтобы
+сравнивать код, а не шум планировщика. Внешние сервисы не нужны.
+
+Запуск: python -m benchmarks.metrics_overhead --calls 200000 --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from benchmarks.report import emit
+from helpers.metrics import (
+    CACHE_REQUESTS,
+    REDIS_COMMAND_DURATION,
+    MetricsMiddleware,
+    timed,
+)
+
+
+async def noop() -> None:
+    return None
+
+
+timed_noop = timed(REDIS_COMMAND_DURATION, operation="benchmark")(noop)
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    """Минимальное приложение с одним роутом с параметром пути."""
+    app = FastAPI()
+
+    @app.get("/orders/{order_id}/")
+    async def get_order(order_id: str) -> dict:
+        return {"id": order_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def request(app: FastAPI, path: str) -> None:
+    """Один HTTP запрос напрямую через ASGI без сети."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        return None
+
+    await app(scope, receive, send)
+
+
+async def best_of(rounds: int, run) -> float:
+    """Лучшее время из rounds прогонов в секундах."""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def compare(base: float, instrumented: float, count: int, unit: float) -> dict:
+    """Время на операцию без метрик и с ними, в единицах unit."""
+    return {
+        "base": round(base / count * unit, 3),
+        "instrumented": round(instrumented / count * unit, 3),
+        "overhead": round((instrumented - base) / count * unit, 3),
+        "overhead_pct": round((instrumented - base) / base * 100, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    calls, requests = args.calls, args.requests
+
+    async def run_calls(func) -> None:
+        for _ in range(calls):
+            await func()
+
+    async def run_counter() -> None:
+        counter = CACHE_REQUESTS.labels("benchmark", "near", "hit")
+        for _ in range(calls):
+            counter.inc()
+
+    async def run_loop() -> None:
+        for _ in range(calls):
+            pass
+
+    plain_app, metrics_app = make_app(False), make_app(True)
+
+    async def run_requests(app: FastAPI) -> None:
+        for i in range(requests):
+            await request(app, f"/orders/{i}/")
+
+    # Прогрев: сборка стека middleware и первые метки
+    await request(plain_app, "/orders/0/")
+    await request(metrics_app, "/orders/0/")
+
+    loop_time = await best_of(args.rounds, run_loop)
+    results = {
+        "timed_ns": compare(
+            await best_of(args.rounds, lambda: run_calls(noop)),
+            await best_of(args.rounds, lambda: run_calls(timed_noop)),
+            calls,
+            1e9,
+        ),
+        "counter_inc_ns": round(
+            (await best_of(args.rounds, run_counter) - loop_time) / calls * 1e9, 3
+        ),
+        "request_us": compare(
+            await best_of(args.rounds, lambda: run_requests(plain_app)),
+            await best_of(args.rounds, lambda: run_requests(metrics_app)),
+            requests,
+            1e6,
+        ),
+    }
+    emit("metrics_overhead", vars(args), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
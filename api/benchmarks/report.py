@@ -0,0 +1,76 @@
+"""Модуль вывода результатов бенчмарков в формате JSON."""
+
+import platform
+import statistics
+import sys
+from datetime import datetime, timezone
+
+import orjson
+
+
+def emit(benchmark: str, params: dict, results: dict) -> dict:
+    """
+    Функция вывода результата бенчмарка в stdout одной JSON-записью.
+
+    Args:
+        benchmark (str): Название бенчмарка
+        params (dict): Параметры запуска
+        results (dict): Замеры
+
+    Returns:
+        dict: Выведенная запись
+    """
+    record = {
+        "benchmark": benchmark,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+    sys.stdout.write(orjson.dumps(record, option=orjson.OPT_INDENT_2).decode() + "\n")
+    return record
+
+
+def per_second(count: int, seconds: float) -> float | None:
+    """
+    Функция расчёта пропускной способности.
+
+    Args:
+        count (int): Количество выполненных операций
+        seconds (float): Длительность замера в секундах
+
+    Returns:
+        float | None: Операций в секунду, None при нулевой длительности
+    """
+    if seconds <= 0:
+        return None
+    return round(count / seconds, 1)
+
+
+def percentiles(samples: list[float], scale: float = 1000.0) -> dict:
+    """
+    Функция расчёта перцентилей задержек.
+
+    Args:
+        samples (list[float]): Замеры в секундах
+        scale (float): Множитель единиц, по умолчанию в миллисекунды
+
+    Returns:
+        dict: count, mean, p50, p95, p99, max
+    """
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def pick(q: float) -> float:
+        return round(ordered[min(last, int(q * len(ordered)))] * scale, 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered) * scale, 3),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1] * scale, 3),
+    }
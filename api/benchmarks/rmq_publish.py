@@ -0,0 +1,89 @@
+"""
+Бенчмарк публикации событий заказов в RMQ.
+
+Сравнивает прежнюю схему (соединение, канал и объявление топологии на каждое
+сообщение) с пулом постоянных каналов RMQClient. Требуется запущенный RabbitMQ.
+
+Запуск: python -m benchmarks.rmq_publish --count 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from aio_pika import DeliveryMode, ExchangeType, Message, connect_robust
+
+from benchmarks.report import emit, per_second
+from configs import settings
+from rabbit_core.client import RMQClient
+
+EXCHANGE = "bench_orders"
+QUEUE = "bench_orders"
+
+
+async def legacy_publish(url: str, body: str) -> None:
+    """Публикация по схеме до пула каналов."""
+    connection = await connect_robust(url)
+    async with connection:
+        channel = await connection.channel()
+        exchange = await channel.declare_exchange(
+            name=EXCHANGE, type=ExchangeType.DIRECT, durable=True
+        )
+        queue = await channel.declare_queue(name=QUEUE, durable=True)
+        await queue.bind(exchange, routing_key=QUEUE)
+        await exchange.publish(
+            Message(
+                body=body.encode(),
+                delivery_mode=DeliveryMode.PERSISTENT,
+                headers={"task_name": "bench", "content-type": "application/json"},
+            ),
+            routing_key=QUEUE,
+        )
+
+
+async def run(publish, count: int, concurrency: int) -> dict:
+    """Прогон count публикаций с ограничением параллельности."""
+    semaphore = asyncio.Semaphore(concurrency)
+    body = json.dumps({"order_id": "00000000-0000-0000-0000-000000000000"})
+
+    async def one():
+        async with semaphore:
+            await publish(body)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    return {"seconds": round(elapsed, 4), "orders_per_sec": per_second(count, elapsed)}
+
+
+async def main(args: argparse.Namespace) -> None:
+    results = {}
+    if args.mode in ("legacy", "both"):
+        results["legacy"] = await run(
+            lambda body: legacy_publish(args.url, body), args.count, args.concurrency
+        )
+    if args.mode in ("pool", "both"):
+        client = RMQClient()
+        await client.connect(
+            args.url, bindings=[(EXCHANGE, QUEUE)], pool_size=args.pool_size
+        )
+        try:
+            results["pool"] = await run(
+                lambda body: client.send_message(EXCHANGE, QUEUE, body, "bench"),
+                args.count,
+                args.concurrency,
+            )
+        finally:
+            await client.disconnect()
+    emit("rmq_publish", vars(args) | {"url": "<hidden>"}, results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=settings.RMQ_URL)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=settings.RMQ_CHANNEL_POOL_SIZE)
+    parser.add_argument("--mode", choices=["legacy", "pool", "both"], default="both")
+    asyncio.run(main(parser.parse_args()))
@@ -8,6 +8,10 @@ class Configs(BaseSettings):
     LOGLEVEL: Annotated[
         Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], Field("INFO")
     ]
+    LOG_DIR: Annotated[str, Field("log")]
+    LOG_FORMAT: Annotated[Literal["text", "json"], Field("text")]
+    # Доли записываемых INFO/DEBUG записей по логгерам: "логгер=доля" через запятую
+    LOG_SAMPLE_RATES: Annotated[str, Field("")]
 
     # Настройки подключения к основной базе данных.
     POSTGRES_HOST: Annotated[str, Field("postgres")]
@@ -18,6 +22,26 @@ class Configs(BaseSettings):
     POSTGRES_TRANSACTION_TIMEOUT: Annotated[int, Field(30)]
     POSTGRES_ECHO: Annotated[bool, Field(False)]
 
+    # Настройки реплик чтения (хосты через запятую, host или host:port)
+    POSTGRES_REPLICA_HOSTS: Annotated[str, Field("")]
+    POSTGRES_REPLICA_MAX_LAG_SECONDS: Annotated[float, Field(5.0)]
+    POSTGRES_REPLICA_CHECK_INTERVAL: Annotated[float, Field(5.0)]
+    POSTGRES_PRIMARY_STICKY_SECONDS: Annotated[float, Field(5.0)]
+
+    # Настройки пула соединений (для основного сервера и каждой реплики)
+    POSTGRES_POOL_SIZE: Annotated[int, Field(5)]
+    POSTGRES_MAX_OVERFLOW: Annotated[int, Field(10)]
+    POSTGRES_POOL_TIMEOUT: Annotated[float, Field(30.0)]
+    POSTGRES_POOL_RECYCLE: Annotated[int, Field(1800)]
+    POSTGRES_POOL_PRE_PING: Annotated[bool, Field(False)]
+    POSTGRES_POOL_USE_LIFO: Annotated[bool, Field(False)]
+    # Кэши подготовленных выражений asyncpg и SQLAlchemy (0 - выключить,
+    # например за PgBouncer в режиме transaction)
+    POSTGRES_STATEMENT_CACHE_SIZE: Annotated[int, Field(100)]
+    POSTGRES_MAX_CACHED_STATEMENT_LIFETIME: Annotated[int, Field(300)]
+    POSTGRES_MAX_CACHEABLE_STATEMENT_SIZE: Annotated[int, Field(15360)]
+    POSTGRES_PREPARED_STATEMENT_CACHE_SIZE: Annotated[int, Field(100)]
+
     # Настройки rabbitmq
     RMQ_USER: Annotated[str, Field("user")]
     RMQ_PASSWORD: Annotated[str, Field("bitnami")]
@@ -28,6 +52,15 @@ class Configs(BaseSettings):
 
     RMQ_EXCHANGE: Annotated[str, Field("test")]
     RMQ_QUEUE: Annotated[str, Field("test")]
+    RMQ_CHANNEL_POOL_SIZE: Annotated[int, Field(4)]
+    RMQ_BATCH_ENABLED: Annotated[bool, Field(False)]
+    RMQ_BATCH_SIZE: Annotated[int, Field(100)]
+    RMQ_BATCH_LINGER_MS: Annotated[int, Field(5)]
+    RMQ_BATCH_BUFFER_SIZE: Annotated[int, Field(10000)]
+
+    # Настройки ретранслятора outbox
+    OUTBOX_BATCH_SIZE: Annotated[int, Field(100)]
+    OUTBOX_POLL_INTERVAL: Annotated[float, Field(1.0)]
 
     # Настройки Redis
     REDIS_HOST: Annotated[str, Field("")]
@@ -37,14 +70,68 @@ class Configs(BaseSettings):
     REDIS_USER_PASSWORD: Annotated[str, Field("12345")]
     REDIS_TTL_EXPIRE: Annotated[int, Field(15)]
 
+    # Настройки ограничения количества запросов
+    RATE_LIMIT_FAILURE_POLICY: Annotated[
+        Literal["local", "open", "closed"], Field("local")
+    ]
+    RATE_LIMIT_REDIS_TIMEOUT_MS: Annotated[int, Field(50)]
+    RATE_LIMIT_COOLDOWN_SECONDS: Annotated[float, Field(5.0)]
+    RATE_LIMIT_LOCAL_MAX_KEYS: Annotated[int, Field(10000)]
+
+    # Настройки заполнения кэша заказов
+    CACHE_LOCK_TTL_MS: Annotated[int, Field(5000)]
+    CACHE_LOCK_WAIT_MS: Annotated[int, Field(2000)]
+    CACHE_LOCK_POLL_MS: Annotated[int, Field(20)]
+    CACHE_EARLY_REFRESH_SECONDS: Annotated[int, Field(3)]
+    NEAR_CACHE_SIZE: Annotated[int, Field(1024)]
+    NEAR_CACHE_TTL: Annotated[float, Field(2.0)]
+    CACHE_INVALIDATION_CHANNEL: Annotated[str, Field("orders:invalidate")]
+
     # Настройки Токена
     JWT_SECRET_KEY: Annotated[str, Field("Somesecretkey")]
     JWT_ALGORITHM: Annotated[str, Field("HS256")]
     JWT_LIFETIME: Annotated[int, Field(10)]
 
+    # Настройки хэширования паролей
+    HASHER_EXECUTOR: Annotated[Literal["thread", "process"], Field("thread")]
+    HASHER_WORKERS: Annotated[int, Field(4)]
+    HASHER_MAX_CONCURRENCY: Annotated[int, Field(8)]
+
+    # Настройки кэша аутентифицированных пользователей
+    USER_CACHE_SIZE: Annotated[int, Field(10000)]
+    USER_CACHE_TTL: Annotated[int, Field(60)]
+    USER_CACHE_REDIS_ENABLED: Annotated[bool, Field(False)]
+
     # Настройки проекта
     ENV_ALLOWED_ORIGINS: Annotated[str, Field("*")]
 
+    # Настройки выдачи списков заказов
+    ORDERS_PAGE_LIMIT: Annotated[int, Field(50)]
+    ORDERS_PAGE_MAX_LIMIT: Annotated[int, Field(500)]
+    ORDERS_STREAM_CHUNK_SIZE: Annotated[int, Field(1000)]
+    ORDERS_BULK_MAX_SIZE: Annotated[int, Field(1000)]
+    ORDERS_STATUS_BULK_MAX_SIZE: Annotated[int, Field(10000)]
+
+    # Настройки помесячных партиций заказов
+    ORDERS_PARTITION_MONTHS_AHEAD: Annotated[int, Field(3)]
+    ORDERS_PARTITION_RETENTION_MONTHS: Annotated[int, Field(0)]
+    ORDERS_PARTITION_DROP_EXPIRED: Annotated[bool, Field(False)]
+    ORDERS_PARTITION_MAINTENANCE_INTERVAL: Annotated[float, Field(3600.0)]
+
+    # Настройки метрик Prometheus (GET /metrics)
+    METRICS_ENABLED: Annotated[bool, Field(True)]
+
+    # Токен служебных эндпоинтов (GET /metrics, /diagnostics/*),
+    # пусто - эндпоинты закрыты
+    SERVICE_TOKEN: Annotated[str, Field("")]
+
+    # Настройки трассировки OpenTelemetry
+    TRACING_ENABLED: Annotated[bool, Field(False)]
+    TRACING_EXPORTER: Annotated[Literal["otlp", "console", "memory"], Field("otlp")]
+    TRACING_SERVICE_NAME: Annotated[str, Field("orders-api")]
+    TRACING_SAMPLE_RATIO: Annotated[float, Field(1.0)]
+    TRACING_OTLP_ENDPOINT: Annotated[str, Field("http://localhost:4318/v1/traces")]
+
     @computed_field
     @property
     def RMQ_URL(self) -> str:
@@ -73,6 +160,39 @@ class Configs(BaseSettings):
         )
         return url
 
+    @computed_field
+    @property
+    def POSTGRES_REPLICA_URLS(self) -> list[str]:
+        """Метод формирования url реплик чтения.
+        Учётные данные и база те же, что у основного сервера.
+
+        Returns:
+            list[str]: URL для подключения к репликам, пустой если реплик нет.
+        """
+        urls = []
+        for host in filter(None, map(str.strip, self.POSTGRES_REPLICA_HOSTS.split(","))):
+            if ":" not in host:
+                host = f"{host}:{self.POSTGRES_PORT}"
+            urls.append(
+                f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{host}/"
+                f"{self.POSTGRES_DB}"
+            )
+        return urls
+
+    @computed_field
+    @property
+    def LOG_SAMPLE_RATE_MAP(self) -> dict[str, float]:
+        """Метод разбора долей выборки логов.
+
+        Returns:
+            dict[str, float]: Название логгера -> доля записей от 0 до 1
+        """
+        rates = {}
+        for pair in filter(None, map(str.strip, self.LOG_SAMPLE_RATES.split(","))):
+            name, _, rate = pair.partition("=")
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+        return rates
+
     @computed_field
     @property
     def REDIS_URL(self) -> str:
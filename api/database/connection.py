@@ -1,22 +1,66 @@
 """Модуль описание подключения к БД."""
 
+import time
 from typing import AsyncGenerator
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from helpers.logger import logger
+from helpers.metrics import DB_SESSION_DURATION
+from helpers.tracing import instrument_engine
 from configs import settings
+from database.pool import InstrumentedPool
 
-engine = create_async_engine(
-    settings.POSTGRES_URL,
-    echo=settings.POSTGRES_ECHO,
-    connect_args={
-        "server_settings": {
-            "statement_timeout": f"{settings.POSTGRES_TRANSACTION_TIMEOUT * 1000}"
-        }
-    },
-)
+
+def make_engine(url: str) -> AsyncEngine:
+    """
+    Функция создания движка БД с общими настройками проекта.
+
+    Args:
+        url (str): URL подключения к серверу
+
+    Returns:
+        AsyncEngine: Асинхронный движок
+    """
+    engine_ = create_async_engine(
+        url,
+        echo=settings.POSTGRES_ECHO,
+        poolclass=InstrumentedPool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        pool_use_lifo=settings.POSTGRES_POOL_USE_LIFO,
+        connect_args={
+            "server_settings": {
+                "statement_timeout": f"{settings.POSTGRES_TRANSACTION_TIMEOUT * 1000}"
+            },
+            "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            "max_cached_statement_lifetime": (
+                settings.POSTGRES_MAX_CACHED_STATEMENT_LIFETIME
+            ),
+            "max_cacheable_statement_size": (
+                settings.POSTGRES_MAX_CACHEABLE_STATEMENT_SIZE
+            ),
+            "prepared_statement_cache_size": (
+                settings.POSTGRES_PREPARED_STATEMENT_CACHE_SIZE
+            ),
+        },
+    )
+    if settings.TRACING_ENABLED:
+        instrument_engine(engine_)
+    return engine_
+
+
+engine = make_engine(settings.POSTGRES_URL)
+PRIMARY_SESSION_TIMER = DB_SESSION_DURATION.labels("primary")
 async_session_maker = async_sessionmaker(
     engine, expire_on_commit=False, class_=AsyncSession
 )
@@ -39,6 +83,7 @@ async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Функция контекстный менеджер создание соединения в БД.
     """
+    started = time.perf_counter()
     async with async_session_maker() as async_session:
         try:
             yield async_session
@@ -48,3 +93,4 @@ async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
             raise e
         finally:
             await async_session.close()
+            PRIMARY_SESSION_TIMER.observe(time.perf_counter() - started)
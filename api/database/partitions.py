@@ -0,0 +1,227 @@
+"""Модуль обслуживания помесячных партиций таблицы orders."""
+
+import asyncio
+import re
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+from configs import settings
+from database.connection import async_session_maker, engine
+from helpers.logger import logger
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Ключ advisory-блокировки, чтобы партиции обслуживала одна реплика за раз
+PARTITION_LOCK_KEY = 0x6F72646572
+PARTITION_NAME = re.compile(r"^orders_p(\d{4})_(\d{2})$")
+DEFAULT_PARTITION = "orders_default"
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Функция сдвига первого числа месяца на months месяцев.
+
+    Args:
+        month (date): Первое число месяца
+        months (int): Сдвиг, может быть отрицательным
+
+    Returns:
+        date: Первое число месяца после сдвига
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Функция формирования названия партиции месяца, например orders_p2026_10."""
+    return f"orders_p{month.year:04d}_{month.month:02d}"
+
+
+class PartitionMaintainer:
+    def __init__(
+        self,
+        months_ahead: int = 3,
+        retention_months: int = 0,
+        drop_expired: bool = False,
+        interval: float = 3600.0,
+    ):
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.drop_expired = drop_expired
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Метод запуска фонового обслуживания партиций."""
+        self._task = asyncio.create_task(self._run(), name="orders-partitions")
+        logger.info("Orders partition maintenance started")
+
+    async def stop(self) -> None:
+        """Метод остановки фонового обслуживания партиций."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Orders partition maintenance stopped")
+
+    async def _run(self) -> None:
+        """Цикл обслуживания: сразу при старте, затем раз в interval секунд."""
+        while True:
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error(f"Orders partition maintenance error: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def maintain(self, today: date | None = None) -> dict[str, list[str]]:
+        """Метод создания будущих партиций и отключения устаревших.
+
+        Партиции создаются на текущий и months_ahead следующих месяцев, чтобы
+        вставки не попадали в партицию по умолчанию. Если обслуживание отстало
+        и в партиции по умолчанию уже есть заказы месяца, они переносятся
+        в новую партицию (см. _create_partition). При retention_months > 0
+        партиции месяцев старше срока хранения отключаются (DETACH) и, если
+        включено drop_expired, удаляются. Агрегаты user_order_stats при этом
+        не меняются: они считают заказы за всё время.
+
+        Args:
+            today (date | None): Текущая дата, по умолчанию по UTC
+
+        Returns:
+            dict[str, list[str]]: Созданные, заполненные из партиции
+                по умолчанию, отключённые и удалённые партиции
+        """
+        today = today or datetime.now(timezone.utc).date()
+        current = today.replace(day=1)
+        result = {"created": [], "moved": [], "detached": [], "dropped": []}
+        async with async_session_maker() as async_session:
+            locked = await async_session.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": PARTITION_LOCK_KEY},
+            )
+            if not locked:
+                return result
+
+            existing = set(
+                await async_session.scalars(
+                    text(
+                        "SELECT child.relname FROM pg_inherits "
+                        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                        "WHERE parent.relname = 'orders'"
+                    )
+                )
+            )
+
+            for offset in range(self.months_ahead + 1):
+                month = add_months(current, offset)
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                if await self._create_partition(
+                    async_session, month, DEFAULT_PARTITION in existing
+                ):
+                    result["moved"].append(name)
+                result["created"].append(name)
+
+            if self.retention_months > 0:
+                cutoff = add_months(current, -self.retention_months)
+                for name in sorted(existing):
+                    match = PARTITION_NAME.match(name)
+                    if match is None:
+                        continue
+                    if date(int(match[1]), int(match[2]), 1) >= cutoff:
+                        continue
+                    await async_session.execute(
+                        text(f"ALTER TABLE orders DETACH PARTITION {name}")
+                    )
+                    result["detached"].append(name)
+                    if self.drop_expired:
+                        await async_session.execute(text(f"DROP TABLE {name}"))
+                        result["dropped"].append(name)
+
+            await async_session.commit()
+
+        if any(result.values()):
+            logger.info(f"Orders partitions maintained: {result}")
+        return result
+
+    @staticmethod
+    async def _create_partition(
+        async_session: "AsyncSession", month: date, has_default: bool
+    ) -> bool:
+        """
+        Метод создания партиции месяца.
+
+        CREATE TABLE ... PARTITION OF падает, пока в партиции по умолчанию
+        есть строки этого диапазона. Тогда партиция по умолчанию отключается,
+        создаётся партиция месяца, строки переносятся в неё и партиция
+        по умолчанию подключается обратно. Всё выполняется в транзакции
+        обслуживания, на время которой orders заблокирована (ACCESS EXCLUSIVE).
+
+        Args:
+            async_session (AsyncSession): Асинхронная сессия в БД.
+            month (date): Первое число месяца
+            has_default (bool): Есть ли у orders партиция по умолчанию
+
+        Returns:
+            bool: True, если строки перенесены из партиции по умолчанию
+        """
+        start = f"{month.isoformat()} 00:00:00+00"
+        end = f"{add_months(month, 1).isoformat()} 00:00:00+00"
+        create = text(
+            f"CREATE TABLE {partition_name(month)} PARTITION OF orders "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+        in_range = f"created_at >= '{start}' AND created_at < '{end}'"
+        misplaced = has_default and await async_session.scalar(
+            text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})")
+        )
+        if not misplaced:
+            await async_session.execute(create)
+            return False
+
+        logger.warning(
+            f"Orders for {month:%Y-%m} found in {DEFAULT_PARTITION}, "
+            f"moving them to {partition_name(month)}"
+        )
+        await async_session.execute(
+            text(f"ALTER TABLE orders DETACH PARTITION {DEFAULT_PARTITION}")
+        )
+        await async_session.execute(create)
+        await async_session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} "
+                f"RETURNING *) INSERT INTO orders SELECT * FROM moved"
+            )
+        )
+        await async_session.execute(
+            text(f"ALTER TABLE orders ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+        )
+        return True
+
+
+partition_maintainer = PartitionMaintainer(
+    months_ahead=settings.ORDERS_PARTITION_MONTHS_AHEAD,
+    retention_months=settings.ORDERS_PARTITION_RETENTION_MONTHS,
+    drop_expired=settings.ORDERS_PARTITION_DROP_EXPIRED,
+    interval=settings.ORDERS_PARTITION_MAINTENANCE_INTERVAL,
+)
+
+
+if __name__ == "__main__":
+    # Разовый запуск обслуживания, например из cron: python -m database.partitions
+    async def main() -> None:
+        try:
+            await partition_maintainer.maintain()
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Модуль пула соединений БД со статистикой ожидания соединений."""
+
+import bisect
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+__all__ = ["InstrumentedPool", "PoolStats"]
+
+# Верхние границы корзин гистограммы ожидания соединения, мс
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolStats:
+    """Счётчики выдачи соединений из пула."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        # Последняя корзина - ожидания дольше WAIT_BUCKETS_MS[-1]
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe(self, wait: float) -> None:
+        """
+        Метод учёта выдачи соединения.
+
+        Args:
+            wait (float): Время ожидания соединения в секундах
+        """
+        self.checkouts += 1
+        self.wait_sum += wait
+        self.wait_max = max(self.wait_max, wait)
+        self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait * 1000)] += 1
+
+    def histogram(self) -> dict[str, int]:
+        """Метод получения накопительной гистограммы ожидания, как в Prometheus."""
+        result, total = {}, 0
+        for bound, count in zip((*WAIT_BUCKETS_MS, "+Inf"), self.wait_buckets):
+            total += count
+            result[f"le_{bound}ms" if bound != "+Inf" else "le_inf"] = total
+        return result
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, который считает время ожидания свободного соединения
+    и таймауты выдачи. Время включает открытие нового соединения, если
+    в пуле нет свободного.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.observe(time.perf_counter() - started)
+        return connection
+
+    def snapshot(self) -> dict:
+        """Метод получения текущего состояния пула и счётчиков выдачи."""
+        stats = self.stats
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait_ms": {
+                "avg": round(stats.wait_sum / stats.checkouts * 1000, 3)
+                if stats.checkouts
+                else 0.0,
+                "max": round(stats.wait_max * 1000, 3),
+                "histogram": stats.histogram(),
+            },
+        }
@@ -1,14 +1,46 @@
 """Модуль работы с БД."""
 
-from typing import TYPE_CHECKING
-from sqlalchemy import select
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, AsyncIterator, Iterable
+from uuid import UUID
 
-from helpers.hashers import verify_password
+from sqlalchemy import (
+    TIMESTAMP,
+    Row,
+    Select,
+    Uuid,
+    any_,
+    delete,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+
+from helpers.enums import OrderStatus
+from helpers.hashers import verify_password_async
+from helpers.order_ids import new_order_key, order_created_at, orders_created_at
+from models.order_stats import UserOrderStats
 from models.orders import Orders
+from models.outbox import Outbox
 from models.users import Users
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
+    from schemas.orders import OrdersFilter, OrdersListFilter
+
+# Колонки схемы Order: списки читаются кортежами без создания ORM объектов
+ORDER_COLUMNS = (
+    Orders.id,
+    Orders.items,
+    Orders.total_price,
+    Orders.status,
+    Orders.created_at,
+)
 
 
 async def get_user_by_email(email: str, async_session: "AsyncSession") -> Users | None:
@@ -60,43 +92,380 @@ async def authenticate_user(
     if user is None:
         return None
 
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         return None
 
     return user
 
 
-async def get_order_by_id(id_: str, async_session: "AsyncSession") -> Orders | None:
+async def get_order_by_id(
+    id_: str, async_session: "AsyncSession", for_update: bool = False
+) -> Orders | None:
     """
     Функция для получения данных заказа по идентификатору.
+    Для UUIDv7 идентификаторов условие по created_at из id оставляет
+    одну партицию и поиск идёт по первичному ключу.
 
     Args:
         id_ (str): Идентификатор
         async_session (AsyncSession): Асинхронная сессия в БД.
+        for_update (bool): Заблокировать строку до конца транзакции
 
     Returns:
         Orders | None: Информация по заказу, если найдена
     """
     stmt = select(Orders).where(Orders.id == id_)
+    created_at = order_created_at(id_)
+    if created_at is not None:
+        stmt = stmt.where(Orders.created_at == created_at)
+    if for_update:
+        stmt = stmt.with_for_update()
     return await async_session.scalar(stmt)
 
 
+def _orders_stmt(
+    user_id: str | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    filters: "OrdersListFilter | None" = None,
+) -> Select:
+    """
+    Функция формирования запроса заказов в порядке keyset-пагинации.
+    Условия по created_at (курсор, created_from/created_to) отсекают лишние
+    партиции. Сортировка (created_at, id) по убыванию совпадает с индексами
+    ix_orders_created_at_id, ix_orders_users_id_created_at_id,
+    ix_orders_status_created_at_id и частичным ix_orders_pending_created_at_id.
+
+    Args:
+        user_id (str | None): Идентификатор пользователя
+        after (tuple[datetime, UUID] | None): Ключ последней выданной записи
+        filters (OrdersListFilter | None): Условия отбора
+
+    Returns:
+        Select: Запрос колонок ORDER_COLUMNS без ограничения по количеству
+    """
+    stmt = select(*ORDER_COLUMNS).order_by(Orders.created_at.desc(), Orders.id.desc())
+    if user_id is not None:
+        stmt = stmt.where(Orders.users_id == user_id)
+    if filters is not None:
+        if filters.status is not None:
+            stmt = stmt.where(Orders.status == filters.status)
+        if filters.created_from is not None:
+            stmt = stmt.where(Orders.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            stmt = stmt.where(Orders.created_at < filters.created_to)
+        if filters.min_total_price is not None:
+            stmt = stmt.where(Orders.total_price >= filters.min_total_price)
+        if filters.max_total_price is not None:
+            stmt = stmt.where(Orders.total_price <= filters.max_total_price)
+    if after is not None:
+        # Сравнение кортежей не отсекает партиции, поэтому условие
+        # по created_at дублируется отдельно
+        stmt = stmt.where(
+            Orders.created_at <= after[0],
+            tuple_(Orders.created_at, Orders.id) < tuple_(*after),
+        )
+    return stmt
+
+
 async def get_orders(
     async_session: "AsyncSession",
     user_id: str | None = None,
-) -> list[Orders] | list:
+    limit: int = 50,
+    after: tuple[datetime, UUID] | None = None,
+    filters: "OrdersListFilter | None" = None,
+) -> tuple[list[Row], tuple[datetime, UUID] | None]:
     """
-    Функция для получения данных заказов.
+    Функция для получения страницы заказов.
     В случае передачи идентификатора пользователя -> выдаются заказы пользователя.
+    Заказы возвращаются строками с колонками ORDER_COLUMNS, без ORM объектов.
 
     Args:
-        user_id (str): Идентификатор
         async_session (AsyncSession): Асинхронная сессия в БД.
+        user_id (str | None): Идентификатор пользователя
+        limit (int): Размер страницы
+        after (tuple[datetime, UUID] | None): Ключ, после которого начинается страница
+        filters (OrdersListFilter | None): Условия отбора
 
     Returns:
-        list[Orders] | list: Информация по заказам, если найдены иначе пустой список
+        tuple[list[Row], tuple[datetime, UUID] | None]: Заказы страницы
+            и ключ для следующей страницы, если она есть
     """
-    stmt = select(Orders)
-    if user_id is not None:
-        stmt = stmt.where(Orders.users_id == user_id)
-    return await async_session.scalars(stmt)
+    stmt = _orders_stmt(user_id, after, filters).limit(limit + 1)
+    orders = list(await async_session.execute(stmt))
+    if len(orders) <= limit:
+        return orders, None
+    orders = orders[:limit]
+    last = orders[-1]
+    return orders, (last.created_at, last.id)
+
+
+async def stream_orders(
+    async_session: "AsyncSession",
+    user_id: str | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    chunk_size: int = 1000,
+    filters: "OrdersListFilter | None" = None,
+) -> AsyncIterator[Row]:
+    """
+    Функция потоковой выдачи заказов через серверный курсор.
+    В памяти одновременно находится не более chunk_size записей.
+    Заказы выдаются строками с колонками ORDER_COLUMNS.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        user_id (str | None): Идентификатор пользователя
+        after (tuple[datetime, UUID] | None): Ключ, после которого начинается выдача
+        chunk_size (int): Количество записей, забираемых из курсора за раз
+        filters (OrdersListFilter | None): Условия отбора
+
+    Yields:
+        Row: Заказ
+    """
+    stmt = _orders_stmt(user_id, after, filters).execution_options(
+        yield_per=chunk_size
+    )
+    result = await async_session.stream(stmt)
+    async for order in result:
+        yield order
+
+
+async def create_orders(
+    async_session: "AsyncSession", user_id: UUID, orders: list[dict]
+) -> list[Orders]:
+    """
+    Функция создания пачки заказов одним INSERT ... RETURNING.
+    Агрегаты пользователя меняются в той же транзакции.
+    Идентификаторы (UUIDv7) и created_at из них генерируются на клиенте:
+    RETURNING без sort_by_parameter_order не гарантирует порядок строк, но
+    insertmanyvalues отправляет пачку одним запросом, а порядок
+    восстанавливается по id.
+    С sort_by_parameter_order и серверным gen_random_uuid() у таблицы нет
+    sentinel-колонки, и SQLAlchemy отправил бы по запросу на строку.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        user_id (UUID): Идентификатор владельца заказов
+        orders (list[dict]): Данные заказов
+
+    Returns:
+        list[Orders]: Созданные заказы в порядке переданных данных
+    """
+    rows = []
+    for order in orders:
+        order_id, created_at = new_order_key()
+        rows.append(
+            {"id": order_id, "created_at": created_at, "users_id": user_id, **order}
+        )
+    result = await async_session.scalars(insert(Orders).returning(Orders), rows)
+    by_id = {order.id: order for order in result}
+    created = [by_id[row["id"]] for row in rows]
+    await apply_order_stats(
+        async_session,
+        [(user_id, order.status, 1, order.total_price) for order in created],
+    )
+    return created
+
+
+async def update_orders_status(
+    async_session: "AsyncSession",
+    status: OrderStatus,
+    users_id: UUID,
+    ids: list[UUID] | None = None,
+    filters: "OrdersFilter | None" = None,
+    limit: int | None = None,
+) -> list[UUID]:
+    """
+    Функция смены статуса множества заказов одним UPDATE ... RETURNING.
+    Меняются только заказы пользователя users_id. Идентификаторы передаются
+    одним параметром-массивом (id = ANY(:ids)), заказы уже в целевом статусе
+    не перезаписываются. Прежние статусы читаются в CTE с блокировкой строк
+    (не больше limit) и идут на изменение агрегатов пользователей в той же
+    транзакции.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        status (OrderStatus): Новый статус
+        users_id (UUID): Владелец заказов
+        ids (list[UUID] | None): Идентификаторы заказов
+        filters (OrdersFilter | None): Условия отбора заказов
+        limit (int | None): Максимум изменяемых заказов
+
+    Returns:
+        list[UUID]: Идентификаторы изменённых заказов
+    """
+    target = select(
+        Orders.id,
+        Orders.created_at,
+        Orders.users_id,
+        Orders.status,
+        Orders.total_price,
+    ).where(Orders.users_id == users_id, Orders.status != status)
+    if ids is not None:
+        target = target.where(Orders.id == any_(literal(ids, ARRAY(Uuid))))
+        created_at = orders_created_at(ids)
+        if created_at is not None:
+            target = target.where(
+                Orders.created_at == any_(literal(created_at, ARRAY(TIMESTAMP(True))))
+            )
+    if filters is not None:
+        if filters.status is not None:
+            target = target.where(Orders.status == filters.status)
+        if filters.created_from is not None:
+            target = target.where(Orders.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            target = target.where(Orders.created_at < filters.created_to)
+    if limit is not None:
+        target = target.limit(limit)
+    target = target.with_for_update().cte("target")
+
+    stmt = (
+        update(Orders)
+        .where(Orders.id == target.c.id, Orders.created_at == target.c.created_at)
+        .values(status=status)
+        .returning(Orders.id, target.c.users_id, target.c.status, target.c.total_price)
+        .execution_options(synchronize_session=False)
+    )
+    rows = (await async_session.execute(stmt)).all()
+    await apply_order_stats(
+        async_session,
+        [
+            change
+            for row in rows
+            for change in status_changes(
+                row.users_id, row.total_price, row.status, status
+            )
+        ],
+    )
+    return [row.id for row in rows]
+
+
+def status_changes(
+    users_id: UUID, total_price: Decimal, old: OrderStatus, new: OrderStatus
+) -> list[tuple[UUID, OrderStatus, int, Decimal]]:
+    """
+    Функция формирования дельт агрегатов при смене статуса заказа.
+
+    Args:
+        users_id (UUID): Владелец заказа
+        total_price (Decimal): Цена заказа
+        old (OrderStatus): Прежний статус
+        new (OrderStatus): Новый статус
+
+    Returns:
+        list[tuple[UUID, OrderStatus, int, Decimal]]: Дельты для apply_order_stats
+    """
+    if old == new:
+        return []
+    return [(users_id, old, -1, -total_price), (users_id, new, 1, total_price)]
+
+
+async def apply_order_stats(
+    async_session: "AsyncSession",
+    changes: Iterable[tuple[UUID, OrderStatus, int, Decimal]],
+) -> None:
+    """
+    Функция изменения агрегатов заказов пользователей дельтами.
+    Дельты по одной паре (пользователь, статус) складываются заранее и
+    применяются одним INSERT ... ON CONFLICT DO UPDATE. Строки идут в порядке
+    ключа, чтобы конкурентные транзакции блокировали их в одной
+    последовательности.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        changes (Iterable[tuple[UUID, OrderStatus, int, Decimal]]): Дельты
+            (пользователь, статус, количество, сумма)
+    """
+    deltas: dict[tuple[UUID, OrderStatus], list] = defaultdict(lambda: [0, Decimal(0)])
+    for users_id, status, count, total_price in changes:
+        delta = deltas[(users_id, status)]
+        delta[0] += count
+        delta[1] += total_price
+
+    rows = [
+        {
+            "users_id": users_id,
+            "status": status,
+            "orders_count": count,
+            "total_price": total_price,
+        }
+        for (users_id, status), (count, total_price) in sorted(
+            deltas.items(), key=lambda item: (item[0][0], item[0][1].value)
+        )
+        if count or total_price
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(UserOrderStats).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserOrderStats.users_id, UserOrderStats.status],
+        set_={
+            "orders_count": UserOrderStats.orders_count + stmt.excluded.orders_count,
+            "total_price": UserOrderStats.total_price + stmt.excluded.total_price,
+        },
+    )
+    await async_session.execute(stmt)
+
+
+async def get_order_stats(
+    async_session: "AsyncSession", user_id: UUID
+) -> list[UserOrderStats]:
+    """
+    Функция получения агрегатов заказов пользователя.
+    Не больше одной строки на статус, независимо от количества заказов.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        user_id (UUID): Идентификатор пользователя
+
+    Returns:
+        list[UserOrderStats]: Агрегаты по статусам
+    """
+    stmt = select(UserOrderStats).where(UserOrderStats.users_id == user_id)
+    return list(await async_session.scalars(stmt))
+
+
+async def add_outbox_events(async_session: "AsyncSession", events: list[dict]) -> None:
+    """
+    Функция записи пачки событий в outbox одним запросом.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        events (list[dict]): Данные событий (exchange, routing_key, task_name, payload)
+    """
+    if events:
+        await async_session.execute(insert(Outbox), events)
+
+
+async def get_outbox_batch(async_session: "AsyncSession", limit: int) -> list[Outbox]:
+    """
+    Функция захвата пачки неотправленных событий.
+    Строки блокируются до конца транзакции, уже заблокированные другими
+    репликами пропускаются (FOR UPDATE SKIP LOCKED).
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        limit (int): Максимальный размер пачки
+
+    Returns:
+        list[Outbox]: События в порядке создания
+    """
+    stmt = (
+        select(Outbox)
+        .order_by(Outbox.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(await async_session.scalars(stmt))
+
+
+async def delete_outbox_events(async_session: "AsyncSession", ids: list[UUID]) -> None:
+    """
+    Функция удаления отправленных событий.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        ids (list[UUID]): Идентификаторы событий
+    """
+    if ids:
+        await async_session.execute(delete(Outbox).where(Outbox.id.in_(ids)))
@@ -0,0 +1,223 @@
+"""Модуль маршрутизации чтения на реплики БД."""
+
+import asyncio
+import itertools
+import time
+from typing import TYPE_CHECKING, AsyncGenerator
+
+from fastapi import Depends
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from configs import settings
+from database.connection import async_session_maker, make_engine
+from helpers.auth import get_current_user
+from helpers.logger import logger
+from helpers.metrics import DB_SESSION_DURATION
+from helpers.ttl_cache import TTLCache
+from redis_core.client import RedisClient, redis_client
+
+if TYPE_CHECKING:
+    from uuid import UUID
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from schemas.users import CurrentUser
+
+__all__ = ["get_read_db_session", "get_read_session_maker", "replica_router"]
+
+# Отставание реплики в секундах; 0, если всё полученное WAL уже применено
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+# Таймер сессии чтения: по признаку чтения с основного сервера
+SESSION_TIMERS = {
+    True: DB_SESSION_DURATION.labels("primary"),
+    False: DB_SESSION_DURATION.labels("replica"),
+}
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.name = url.rsplit("@", 1)[-1]
+        self.engine: "AsyncEngine" = make_engine(url)
+        self.session_maker = async_sessionmaker(
+            self.engine, expire_on_commit=False, class_=AsyncSession
+        )
+        # None - отставание неизвестно или реплика недоступна
+        self.lag: float | None = None
+
+
+class ReplicaRouter:
+    """
+    Выбор сервера для чтения: реплики по кругу среди тех, чьё отставание
+    не больше max_lag, иначе основной сервер. Пользователь, который недавно
+    писал, читает с основного сервера sticky_seconds, чтобы видеть свои
+    изменения. Метка записи хранится локально и в Redis, общем для реплик API.
+    """
+
+    key_prefix = "sticky:"
+
+    def __init__(
+        self,
+        urls: list[str],
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+        sticky_seconds: float = 5.0,
+        redis: RedisClient | None = None,
+    ):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        self.redis = redis
+        self._sticky = TTLCache(maxsize=10000, ttl=sticky_seconds)
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Метод запуска фоновой проверки отставания реплик."""
+        if not self.replicas:
+            return
+        self._task = asyncio.create_task(self._run(), name="replica-lag-check")
+        logger.info(f"Read replicas: {', '.join(r.name for r in self.replicas)}")
+
+    async def stop(self) -> None:
+        """Метод остановки проверки и закрытия пулов реплик."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _run(self) -> None:
+        """Цикл проверки отставания реплик."""
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    async def _check_one(self, replica: Replica) -> None:
+        """Метод замера отставания одной реплики."""
+        try:
+            async with replica.engine.connect() as connection:
+                lag = await asyncio.wait_for(
+                    connection.scalar(LAG_QUERY), self.check_interval
+                )
+        except Exception as e:
+            if replica.lag is not None:
+                logger.warning(f"Replica {replica.name} unavailable: {e}")
+            replica.lag = None
+            return
+        replica.lag = float(lag)
+        if replica.lag > self.max_lag:
+            logger.warning(f"Replica {replica.name} lag {replica.lag:.1f}s")
+
+    async def check(self) -> None:
+        """Метод замера отставания всех реплик."""
+        await asyncio.gather(*(self._check_one(replica) for replica in self.replicas))
+
+    def session_maker(self, primary: bool = False) -> async_sessionmaker:
+        """
+        Метод выбора фабрики сессий для чтения.
+
+        Args:
+            primary (bool): Читать с основного сервера
+
+        Returns:
+            async_sessionmaker: Фабрика сессий реплики или основного сервера
+        """
+        if primary:
+            return async_session_maker
+        healthy = [
+            replica
+            for replica in self.replicas
+            if replica.lag is not None and replica.lag <= self.max_lag
+        ]
+        if not healthy:
+            return async_session_maker
+        return healthy[next(self._counter) % len(healthy)].session_maker
+
+    async def mark_write(self, user_id: "UUID") -> None:
+        """
+        Метод пометки пользователя, который только что записал данные.
+
+        Args:
+            user_id (UUID): Идентификатор пользователя
+        """
+        if not self.replicas:
+            return
+        self._sticky.set(user_id, True)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set_flag(
+                f"{self.key_prefix}{user_id}", int(self.sticky_seconds * 1000)
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to mark user {user_id} sticky: {e}")
+
+    async def is_sticky(self, user_id: "UUID") -> bool:
+        """
+        Метод проверки, должен ли пользователь читать с основного сервера.
+        При недоступности Redis читаем с основного сервера.
+
+        Args:
+            user_id (UUID): Идентификатор пользователя
+
+        Returns:
+            bool: True, если пользователь писал в последние sticky_seconds
+        """
+        if not self.replicas:
+            return False
+        if self._sticky.get(user_id):
+            return True
+        if self.redis is None:
+            return False
+        try:
+            return await self.redis.exists(f"{self.key_prefix}{user_id}")
+        except RedisError:
+            return True
+
+
+replica_router = ReplicaRouter(
+    settings.POSTGRES_REPLICA_URLS,
+    max_lag=settings.POSTGRES_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.POSTGRES_REPLICA_CHECK_INTERVAL,
+    sticky_seconds=settings.POSTGRES_PRIMARY_STICKY_SECONDS,
+    redis=redis_client,
+)
+
+
+async def get_read_session_maker(
+    current_user: "CurrentUser" = Depends(get_current_user),
+) -> async_sessionmaker:
+    """
+    Функция выбора фабрики сессий для чтения текущим пользователем.
+    """
+    sticky = await replica_router.is_sticky(current_user.id)
+    return replica_router.session_maker(primary=sticky)
+
+
+async def get_read_db_session(
+    session_maker: async_sessionmaker = Depends(get_read_session_maker),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Функция контекстный менеджер создание соединения для чтения:
+    с реплики, если она не отстаёт, иначе с основного сервера.
+    """
+    timer = SESSION_TIMERS[session_maker is async_session_maker]
+    started = time.perf_counter()
+    async with session_maker() as async_session:
+        try:
+            yield async_session
+        except Exception as e:
+            await async_session.rollback()
+            logger.error(f"Transaction error: {e}")
+            raise e
+        finally:
+            await async_session.close()
+            timer.observe(time.perf_counter() - started)
@@ -1,5 +1,6 @@
 """Модуль работы с JWT."""
 
+import secrets
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING
 
@@ -8,11 +9,13 @@ from jose import jwt, JWTError
 from configs import settings
 from database.connection import get_async_db_session
 from database.query import get_user_by_id
+from helpers.user_cache import user_cache
+from schemas.users import CurrentUser
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
-__all__ = ["create_access_token", "get_current_user"]
+__all__ = ["check_service_token", "create_access_token", "get_current_user"]
 
 
 def create_access_token(data: dict) -> str:
@@ -58,16 +61,18 @@ def get_token(request: Request) -> str:
 async def get_current_user(
     token: str = Depends(get_token),
     async_session: "AsyncSession" = Depends(get_async_db_session),
-):
+) -> CurrentUser:
     """
     Функция обработки переданного токена + аутентификация пользователя.
+    Пользователь берётся из user_cache, в БД идём только при промахе:
+    сессия создаётся лениво, поэтому при попадании соединение из пула не берётся.
 
     Args:
         token (str): Токен
         async_session (AsyncSession): Асинхронная сессия в БД.
 
     Returns:
-        Users: Сущность пользователя
+        CurrentUser: Сущность пользователя
 
     Raises:
         HTTPException: Ошибку получим если:
@@ -97,9 +102,38 @@ async def get_current_user(
         error.detail = "Отсутствует идентификатор пользователя"
         raise error
 
-    user = await get_user_by_id(user_id, async_session)
-    if user is None:
+    user = await user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    db_user = await get_user_by_id(user_id, async_session)
+    if db_user is None:
         error.detail = "Пользователь не найден"
         raise error
 
+    user = CurrentUser.model_validate(db_user)
+    await user_cache.set(user, token_expire=expire)
     return user
+
+
+def check_service_token(request: Request) -> None:
+    """
+    Функция проверки токена служебных эндпоинтов (метрики, диагностика).
+    Пока SERVICE_TOKEN не задан, эндпоинты отвечают 404.
+
+    Args:
+        request (Request): Сущность запроса по FastAPI, содержащая информация о запросе.
+
+    Raises:
+        HTTPException: Ошибку получим если:
+            - SERVICE_TOKEN не задан
+            - Токен не был передан
+            - Токен не совпадает с SERVICE_TOKEN
+    """
+    if not settings.SERVICE_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    token = get_token(request)
+    if not secrets.compare_digest(token, settings.SERVICE_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Токен не валиден"
+        )
@@ -1,9 +1,19 @@
 """Модуль описания функции хэширования информации."""
 
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from configs import settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Пул для bcrypt создаётся при первом обращении, семафор ограничивает
+# количество одновременных хэширований.
+_executor: Executor | None = None
+_semaphore = asyncio.Semaphore(settings.HASHER_MAX_CONCURRENCY)
+
 
 def get_password_hash(password: str) -> str:
     """
@@ -30,3 +40,62 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bool: True если совпали, иначе False
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_executor() -> Executor:
+    """
+    Функция получения пула для bcrypt по настройке HASHER_EXECUTOR.
+
+    Returns:
+        Executor: Пул потоков или процессов
+    """
+    global _executor
+    if _executor is None:
+        if settings.HASHER_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.HASHER_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.HASHER_WORKERS, thread_name_prefix="hasher"
+            )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Функция остановки пула хэширования."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Функция хэширования пароля вне event loop.
+
+    Args:
+        password (str): Пароль
+
+    Returns:
+        str: Хэш пароля.
+    """
+    async with _semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Функция проверки хэша пароля вне event loop.
+
+    Args:
+        plain_password (str): Переданный пароль
+        hashed_password (str): Хэш пароля из БД
+
+    Returns:
+        bool: True если совпали, иначе False
+    """
+    async with _semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_executor(), verify_password, plain_password, hashed_password
+        )
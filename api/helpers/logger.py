@@ -1,6 +1,14 @@
 import datetime
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import time
+
+from pythonjsonlogger.json import JsonFormatter
+
+from configs import settings
 
 # Формат название файлов логирования.
 file_name_format = "{year:04d}{month:02d}{day:02d}.log"
@@ -8,6 +16,7 @@ file_name_format = "{year:04d}{month:02d}{day:02d}.log"
 # Формат логирования.
 file_msg_format = "%(asctime)s %(levelname)-8s: %(message)s"
 console_msg_format = "%(levelname)s: %(message)s"
+json_msg_format = "%(asctime)s %(levelname)s %(name)s %(message)s"
 
 # Максимальное кол-во байтов для каждого файла.
 max_bytes = 1024**2  # ~ 1MB
@@ -30,8 +39,106 @@ class ColoredFormatter(logging.Formatter):
         return formatted_message
 
 
-def init_logger(init_dir="log", file_level=logging.DEBUG, stream_level=logging.INFO):
-    """Функция инициализации логгера."""
+class DailyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Файл логов на каждый день (YYYYMMDD.log) с ротацией по размеру внутри дня.
+    Имя файла пересчитывается в полночь, а не один раз при запуске.
+    """
+
+    def __init__(self, init_dir: str, max_bytes: int, backup_count: int):
+        self.init_dir = init_dir
+        day = datetime.date.today()
+        self.rollover_at = self._next_midnight(day)
+        super().__init__(
+            filename=self._file_name(day), maxBytes=max_bytes, backupCount=backup_count
+        )
+
+    def _file_name(self, day: datetime.date) -> str:
+        file_name = file_name_format.format(year=day.year, month=day.month, day=day.day)
+        return os.path.join(self.init_dir, file_name)
+
+    @staticmethod
+    def _next_midnight(day: datetime.date) -> float:
+        next_day = day + datetime.timedelta(days=1)
+        return datetime.datetime.combine(next_day, datetime.time()).timestamp()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self) -> None:
+        if time.time() < self.rollover_at:
+            # Ротация по размеру внутри дня
+            super().doRollover()
+            return
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        day = datetime.date.today()
+        self.rollover_at = self._next_midnight(day)
+        self.baseFilename = os.path.abspath(self._file_name(day))
+        self.stream = self._open()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Выборка записей уровня INFO и ниже по логгерам.
+    Доля логгера берётся у ближайшего настроенного родителя
+    ("redis_core" действует на "redis_core.client"), WARNING и выше
+    проходят всегда.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, float] = {}
+
+    def rate(self, name: str) -> float:
+        """Метод получения доли записей логгера."""
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            parent = name
+            while parent:
+                if parent in self.rates:
+                    rate = self.rates[parent]
+                    break
+                parent = parent.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+# Поток записи логов, пока логгер инициализирован
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+
+
+def init_logger(
+    init_dir=settings.LOG_DIR,
+    file_level=logging.DEBUG,
+    stream_level=settings.LOGLEVEL,
+):
+    """
+    Функция инициализации логгера.
+    Код пишет записи в очередь (QueueHandler), а в файл и консоль их выводит
+    QueueListener в отдельном потоке, поэтому логирование не блокирует
+    event loop дисковым вводом-выводом. Формат и выборка берутся из
+    LOG_FORMAT и LOG_SAMPLE_RATES.
+
+    Returns:
+        QueueListener: Поток записи логов
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG)
 
@@ -40,30 +147,41 @@ def init_logger(init_dir="log", file_level=logging.DEBUG, stream_level=logging.I
     if not os.path.exists(init_dir):
         os.makedirs(init_dir)
 
-    t = datetime.datetime.now()
-    file_name = file_name_format.format(
-        year=t.year,
-        month=t.month,
-        day=t.day,
-    )
-    file_name = os.path.join(init_dir, file_name)
-
-    file_handler = logging.handlers.RotatingFileHandler(
-        filename=file_name, maxBytes=max_bytes, backupCount=backup_count
-    )
+    file_handler = DailyRotatingFileHandler(init_dir, max_bytes, backup_count)
     file_handler.setLevel(file_level)
-    file_formatter = logging.Formatter(file_msg_format)
-    file_handler.setFormatter(file_formatter)
 
     stream_handler = logging.StreamHandler()
     stream_handler.setLevel(stream_level)
-    stream_formatter = ColoredFormatter(console_msg_format)
-    stream_handler.setFormatter(stream_formatter)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
-
-    return
+    if settings.LOG_FORMAT == "json":
+        file_handler.setFormatter(JsonFormatter(json_msg_format))
+        stream_handler.setFormatter(JsonFormatter(json_msg_format))
+    else:
+        file_handler.setFormatter(logging.Formatter(file_msg_format))
+        stream_handler.setFormatter(ColoredFormatter(console_msg_format))
+
+    _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATE_MAP))
+    _listener = logging.handlers.QueueListener(
+        _queue_handler.queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    logger.addHandler(_queue_handler)
+
+    return _listener
+
+
+def stop_logger():
+    """Функция вывода оставшихся в очереди записей и остановки потока записи."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    _queue_handler = None
 
 
 logger = logging.getLogger()
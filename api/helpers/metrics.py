@@ -0,0 +1,139 @@
+"""Модуль метрик Prometheus."""
+
+import functools
+import time
+from typing import Awaitable, Callable, ParamSpec, TypeVar
+
+from prometheus_client import Counter, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from configs import settings
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Границы корзин в секундах: от долей миллисекунды (Redis) до секунд (запросы)
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP запроса",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_SESSION_DURATION = Histogram(
+    "db_session_duration_seconds",
+    "Время жизни сессии БД запроса",
+    ["target"],
+    buckets=LATENCY_BUCKETS,
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Время выполнения операций RedisClient",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+RATE_LIMIT_CHECK_DURATION = Histogram(
+    "rate_limit_check_duration_seconds",
+    "Время проверки лимита запросов",
+    ["backend"],
+    buckets=LATENCY_BUCKETS,
+)
+RMQ_PUBLISH_DURATION = Histogram(
+    "rmq_publish_duration_seconds",
+    "Время отправки сообщения в RMQ до подтверждения брокером",
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Обращения к уровням кэша",
+    ["cache", "level", "result"],
+)
+
+
+def timed(histogram: Histogram, **labels: str):
+    """
+    Декоратор замера времени выполнения корутины в гистограмму.
+    Метки связываются один раз при декорировании, а не на каждый вызов.
+
+    Args:
+        histogram (Histogram): Гистограмма
+        labels (str): Значения меток гистограммы
+    """
+    metric = histogram.labels(**labels) if labels else histogram
+
+    def decorator(
+        func: Callable[P, Awaitable[R]],
+    ) -> Callable[P, Awaitable[R]]:
+        if not settings.METRICS_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware замера времени запросов по шаблону пути роута.
+    Запросы без найденного роута попадают в route="unmatched", чтобы
+    произвольные пути не раздували число временных рядов.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Гистограммы по (метод, роут, статус): labels() дороже самого observe()
+        self._children: dict[tuple[str, str, int], Histogram] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            key = (
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status_code,
+            )
+            child = self._children.get(key)
+            if child is None:
+                child = HTTP_REQUEST_DURATION.labels(key[0], key[1], str(status_code))
+                self._children[key] = child
+            child.observe(elapsed)
@@ -0,0 +1,61 @@
+"""Модуль идентификаторов заказов.
+
+Идентификатор заказа - UUIDv7: первые 48 бит содержат время создания
+в миллисекундах, и created_at заказа берётся из него же. Поэтому по одному
+id восстанавливается весь первичный ключ (id, created_at), и поиск по id
+отсекает все партиции orders, кроме одной. Заказы, созданные до перехода
+на UUIDv7 (случайные UUIDv4), ищутся по id без отсечения партиций.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+__all__ = ["new_order_key", "order_created_at", "orders_created_at"]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def order_created_at(order_id: str | UUID) -> datetime | None:
+    """
+    Функция получения created_at заказа из его идентификатора.
+
+    Args:
+        order_id (str | UUID): Идентификатор заказа
+
+    Returns:
+        datetime | None: Время создания, None для не UUIDv7 идентификаторов
+    """
+    try:
+        order_id = order_id if isinstance(order_id, UUID) else UUID(order_id)
+    except ValueError:
+        return None
+    if order_id.version != 7:
+        return None
+    return EPOCH + timedelta(milliseconds=order_id.int >> 80)
+
+
+def orders_created_at(order_ids: list[UUID]) -> list[datetime] | None:
+    """
+    Функция получения created_at пачки заказов.
+
+    Args:
+        order_ids (list[UUID]): Идентификаторы заказов
+
+    Returns:
+        list[datetime] | None: Времена создания, None если хотя бы один
+            идентификатор не UUIDv7
+    """
+    created = [order_created_at(order_id) for order_id in order_ids]
+    return None if None in created else created
+
+
+def new_order_key() -> tuple[UUID, datetime]:
+    """
+    Функция создания первичного ключа нового заказа.
+
+    Returns:
+        tuple[UUID, datetime]: Идентификатор UUIDv7 и created_at из него
+    """
+    order_id = uuid.uuid7()
+    return order_id, order_created_at(order_id)
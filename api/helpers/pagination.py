@@ -0,0 +1,49 @@
+"""Модуль работы с курсорами keyset-пагинации."""
+
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException, status
+
+__all__ = ["decode_cursor", "encode_cursor"]
+
+
+def encode_cursor(created_at: datetime, id_: UUID) -> str:
+    """
+    Функция формирования непрозрачного курсора по ключу (created_at, id).
+
+    Args:
+        created_at (datetime): Дата-время создания последней записи страницы
+        id_ (UUID): Идентификатор последней записи страницы
+
+    Returns:
+        str: Курсор в формате urlsafe base64
+    """
+    raw = orjson.dumps([created_at.isoformat(), str(id_)])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Функция разбора курсора, полученного от клиента.
+
+    Args:
+        cursor (str): Курсор из encode_cursor
+
+    Returns:
+        tuple[datetime, UUID]: Ключ (created_at, id), после которого продолжается выдача
+
+    Raises:
+        HTTPException: Если курсор повреждён или сформирован не сервисом
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id_ = orjson.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(id_)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор"
+        )
@@ -0,0 +1,220 @@
+"""Модуль трассировки запросов OpenTelemetry."""
+
+import functools
+from typing import TYPE_CHECKING, Awaitable, Callable, ParamSpec, TypeVar
+
+from opentelemetry import trace
+from opentelemetry.propagate import extract, inject
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from configs import settings
+from helpers.logger import logger
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# До init_tracing трейсер ничего не записывает
+tracer = trace.get_tracer("orders-api")
+# Экспортёр в память, если TRACING_EXPORTER=memory (для проверок и бенчмарков)
+memory_exporter: InMemorySpanExporter | None = None
+_provider: TracerProvider | None = None
+
+# Длина текста запроса в атрибуте span, остальное обрезается
+MAX_STATEMENT_LENGTH = 2048
+# Заголовки W3C Trace Context, по которым продолжается входящий trace
+TRACE_HEADERS = (b"traceparent", b"tracestate")
+
+
+def make_exporter() -> SpanExporter:
+    """Функция создания экспортёра span по TRACING_EXPORTER."""
+    global memory_exporter
+    if settings.TRACING_EXPORTER == "memory":
+        memory_exporter = InMemorySpanExporter()
+        return memory_exporter
+    if settings.TRACING_EXPORTER == "console":
+        return ConsoleSpanExporter()
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+        OTLPSpanExporter,
+    )
+
+    return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+
+def init_tracing(exporter: SpanExporter | None = None) -> None:
+    """
+    Функция включения трассировки процесса.
+
+    Args:
+        exporter (SpanExporter | None): Свой экспортёр, по умолчанию
+            по TRACING_EXPORTER. Экспортёр в память пишет span сразу,
+            остальные - пачками в фоне.
+    """
+    global _provider
+    if not settings.TRACING_ENABLED or _provider is not None:
+        return
+    exporter = exporter or make_exporter()
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    processor = (
+        SimpleSpanProcessor(exporter)
+        if isinstance(exporter, InMemorySpanExporter)
+        else BatchSpanProcessor(exporter)
+    )
+    _provider.add_span_processor(processor)
+    trace.set_tracer_provider(_provider)
+    logger.info(f"Tracing enabled, exporter {type(exporter).__name__}")
+
+
+def shutdown_tracing() -> None:
+    """Функция отправки накопленных span и остановки трассировки."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def current_trace_context() -> dict[str, str] | None:
+    """
+    Функция получения контекста текущего span для передачи в другой процесс.
+
+    Returns:
+        dict[str, str] | None: Заголовки W3C Trace Context, None без трассировки
+    """
+    carrier: dict[str, str] = {}
+    inject(carrier)
+    return carrier or None
+
+
+def traced(name: str, attributes: dict[str, str] | None = None):
+    """
+    Декоратор выполнения корутины в span клиента внешнего сервиса.
+
+    Args:
+        name (str): Название span
+        attributes (dict[str, str] | None): Атрибуты span
+    """
+
+    def decorator(
+        func: Callable[P, Awaitable[R]],
+    ) -> Callable[P, Awaitable[R]]:
+        if not settings.TRACING_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with tracer.start_as_current_span(
+                name, kind=SpanKind.CLIENT, attributes=attributes
+            ):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_engine(engine: "AsyncEngine") -> None:
+    """
+    Функция трассировки запросов движка через события SQLAlchemy.
+    Span каждого запроса - дочерний к текущему span запроса HTTP.
+
+    Args:
+        engine (AsyncEngine): Асинхронный движок
+    """
+    sync_engine = engine.sync_engine
+    attributes = {
+        "db.system.name": "postgresql",
+        "db.namespace": engine.url.database or "",
+        "server.address": engine.url.host or "",
+    }
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        operation = (statement.split(None, 1) or [""])[0].upper()
+        context._tracing_span = tracer.start_span(
+            f"{operation} {attributes['db.namespace']}".rstrip(),
+            kind=SpanKind.CLIENT,
+            attributes={
+                **attributes,
+                "db.operation.name": operation,
+                "db.query.text": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        span = getattr(context, "_tracing_span", None)
+        if span is not None:
+            span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_tracing_span", None)
+        if span is None:
+            return
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware span обработки запроса. Продолжает trace из заголовков
+    traceparent/tracestate; название span - метод и шаблон пути роута.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name in TRACE_HEADERS
+        }
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            method,
+            context=extract(carrier) if carrier else None,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
+                span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
@@ -0,0 +1,61 @@
+"""Модуль ограниченного in-process кэша с вытеснением LRU и временем жизни."""
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable
+
+__all__ = ["TTLCache"]
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize (int): Максимальное количество ключей
+            ttl (float): Время жизни записи по умолчанию в секундах
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Метод получения значения, истёкшие записи удаляются при чтении."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Метод сохранения значения с вытеснением самых давних записей."""
+        self._data[key] = (monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any:
+        """Метод удаления значения."""
+        item = self._data.pop(key, None)
+        return None if item is None else item[1]
+
+    def clear(self) -> None:
+        """Метод очистки кэша."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Доля попаданий с момента запуска."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,85 @@
+"""Модуль кэша аутентифицированных пользователей."""
+
+import time
+
+from redis.exceptions import RedisError
+
+from configs import settings
+from helpers.logger import logger
+from helpers.ttl_cache import TTLCache
+from redis_core.client import RedisClient, redis_client
+from schemas.users import CurrentUser
+
+__all__ = ["UserCache", "user_cache"]
+
+
+class UserCache:
+    """
+    Двухуровневый кэш пользователей по claim `sub`: in-process LRU+TTL
+    и, опционально, Redis, общий для всех реплик.
+
+    Записи не сбрасываются при изменении пользователя: изменённый или
+    удалённый пользователь остаётся в кэше до USER_CACHE_TTL секунд
+    (не дольше срока токена).
+    """
+
+    key_prefix = "user:"
+
+    def __init__(self, maxsize: int, ttl: int, redis: RedisClient | None = None):
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.redis = redis
+
+    async def get(self, user_id: str) -> CurrentUser | None:
+        """
+        Метод получения пользователя из кэша.
+
+        Args:
+            user_id (str): Идентификатор пользователя из claim `sub`
+
+        Returns:
+            CurrentUser | None: Пользователь, если найден в одном из уровней
+        """
+        user = self._local.get(user_id)
+        if user is not None or self.redis is None:
+            return user
+        try:
+            ttl, data = await self.redis.check_cache(self.key_prefix + user_id)
+        except RedisError as e:
+            logger.warning(f"User cache: Redis unavailable: {e}")
+            return None
+        if not data:
+            return None
+        user = CurrentUser.model_validate_json(data)
+        if ttl > 0:
+            self._local.set(user_id, user, min(ttl, self.ttl))
+        return user
+
+    async def set(self, user: CurrentUser, token_expire: float) -> None:
+        """
+        Метод сохранения пользователя. Запись живёт не дольше токена.
+
+        Args:
+            user (CurrentUser): Пользователь
+            token_expire (float): Время истечения токена (unix timestamp)
+        """
+        ttl = min(self.ttl, int(token_expire - time.time()))
+        if ttl <= 0:
+            return
+        user_id = str(user.id)
+        self._local.set(user_id, user, ttl)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.add_to_cache(
+                self.key_prefix + user_id, user.model_dump(mode="json"), ttl
+            )
+        except RedisError as e:
+            logger.warning(f"User cache: Redis unavailable: {e}")
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL,
+    redis=redis_client if settings.USER_CACHE_REDIS_ENABLED else None,
+)
@@ -2,13 +2,24 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from configs import settings
 from database.connection import healthcheck as db_healthcheck
-from helpers.logger import init_logger
+from database.partitions import partition_maintainer
+from database.replicas import replica_router
+from helpers.hashers import shutdown_executor as shutdown_hasher
+from helpers.logger import init_logger, stop_logger
+from helpers.metrics import MetricsMiddleware
+from helpers.tracing import TracingMiddleware, init_tracing, shutdown_tracing
 from rabbit_core.client import rmq_client
+from rabbit_core.outbox_relay import outbox_relay
+from redis_core.cache_fill import order_cache
 from redis_core.client import redis_client
+from redis_core.rate_limiter import load_scripts as load_rate_limiter_scripts
 from routers.auth import router as auth_router
+from routers.diagnostics import router as diagnostics_router
+from routers.metrics import router as metrics_router
 from routers.orders import router as order_router
 from routers.ping import router as ping_router
 from routers.redirect import router as redirect_router
@@ -20,21 +31,51 @@ async def lifespan(app_: "FastAPI"):
     Контекст запуска элементов, используемые в проекте такие как: Redis, TaskIQ и т.д.
     """
     init_logger()
+    init_tracing()
     # Инициализация коннекта в Redis
     await redis_client.connect(settings.REDIS_URL)
+    await load_rate_limiter_scripts()
+    # Подписка на инвалидацию ближнего кэша заказов
+    order_cache.start_listener()
     # HealthCheck БД
     await db_healthcheck()
+    # Проверка отставания реплик чтения
+    replica_router.start()
+    # Создание будущих партиций заказов и отключение устаревших
+    partition_maintainer.start()
     # Подключение к RMQ
-    await rmq_client.connect(settings.RMQ_URL)
+    await rmq_client.connect(
+        settings.RMQ_URL,
+        bindings=[(settings.RMQ_EXCHANGE, settings.RMQ_QUEUE)],
+        pool_size=settings.RMQ_CHANNEL_POOL_SIZE,
+    )
+    if settings.RMQ_BATCH_ENABLED:
+        rmq_client.enable_batching(
+            batch_size=settings.RMQ_BATCH_SIZE,
+            linger_ms=settings.RMQ_BATCH_LINGER_MS,
+            buffer_size=settings.RMQ_BATCH_BUFFER_SIZE,
+        )
+    # Фоновая отправка событий из outbox
+    outbox_relay.start()
     yield
 
     # Отключения от внешних сервисов
+    await outbox_relay.stop()
+    await partition_maintainer.stop()
+    await replica_router.stop()
+    await order_cache.stop_listener()
     await rmq_client.disconnect()
     await redis_client.disconnect()
+    shutdown_hasher()
+    shutdown_tracing()
+    # Вывод оставшихся записей лога
+    stop_logger()
 
 
 app = FastAPI(
     lifespan=lifespan,
+    # Ответы моделей и dict кодируются orjson вместо json.dumps
+    default_response_class=ORJSONResponse,
 )
 app.add_middleware(
     CORSMiddleware,
@@ -43,7 +84,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
 app.include_router(redirect_router)
 app.include_router(ping_router)
 app.include_router(auth_router)
 app.include_router(order_router)
+app.include_router(diagnostics_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
@@ -8,7 +8,9 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 from configs import settings
 from models.base import Base
+from models.order_stats import UserOrderStats  # noqa
 from models.orders import Orders  # noqa
+from models.outbox import Outbox  # noqa
 from models.users import Users  # noqa
 
 # this is the Alembic Config object, which provides
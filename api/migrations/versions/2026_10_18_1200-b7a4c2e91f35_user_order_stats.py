@@ -0,0 +1,41 @@
+"""user order stats
+
+Revision ID: b7a4c2e91f35
+Revises: 9e3f2b6c1d80
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7a4c2e91f35'
+down_revision: Union[str, Sequence[str], None] = '9e3f2b6c1d80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_order_stats',
+    sa.Column('users_id', sa.Uuid(), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDING', 'PAID', 'SHIPPED', 'CANCELED', name='orderstatus', create_type=False), nullable=False),
+    sa.Column('orders_count', sa.BigInteger(), nullable=False),
+    sa.Column('total_price', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['users_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('users_id', 'status')
+    )
+    # Начальное заполнение агрегатов по уже существующим заказам
+    op.execute(
+        "INSERT INTO user_order_stats (users_id, status, orders_count, total_price) "
+        "SELECT users_id, status, count(*), sum(total_price) "
+        "FROM orders GROUP BY users_id, status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_order_stats')
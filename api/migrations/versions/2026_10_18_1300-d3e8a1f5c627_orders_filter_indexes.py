@@ -0,0 +1,32 @@
+"""orders filter indexes
+
+Revision ID: d3e8a1f5c627
+Revises: b7a4c2e91f35
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3e8a1f5c627'
+down_revision: Union[str, Sequence[str], None] = 'b7a4c2e91f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_orders_status_created_at_id', 'orders', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_orders_pending_created_at_id', 'orders', ['created_at', 'id'], unique=False, postgresql_where=sa.text("status = 'PENDING'"))
+    op.create_index('ix_orders_total_price', 'orders', ['total_price'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_total_price', table_name='orders')
+    op.drop_index('ix_orders_pending_created_at_id', table_name='orders', postgresql_where=sa.text("status = 'PENDING'"))
+    op.drop_index('ix_orders_status_created_at_id', table_name='orders')
@@ -0,0 +1,130 @@
+"""orders range partitions
+
+Revision ID: e4b9c7d2a018
+Revises: d3e8a1f5c627
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c7d2a018'
+down_revision: Union[str, Sequence[str], None] = 'd3e8a1f5c627'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Сколько месяцев вперёд создаётся сразу; дальше партиции создаёт
+# database.partitions.PartitionMaintainer
+MONTHS_AHEAD = 3
+
+INDEXES = (
+    ('ix_orders_users_id', ['users_id'], None),
+    ('ix_orders_id', ['id'], None),
+    ('ix_orders_created_at_id', ['created_at', 'id'], None),
+    ('ix_orders_users_id_created_at_id', ['users_id', 'created_at', 'id'], None),
+    ('ix_orders_status_created_at_id', ['status', 'created_at', 'id'], None),
+    ('ix_orders_pending_created_at_id', ['created_at', 'id'], "status = 'PENDING'"),
+    ('ix_orders_total_price', ['total_price'], None),
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def rename_indexes(table: str, suffix: str) -> None:
+    for name, _, _ in INDEXES:
+        op.execute(f'ALTER INDEX IF EXISTS {name} RENAME TO {name}{suffix}')
+    op.execute(f'ALTER TABLE {table} RENAME CONSTRAINT orders_pkey TO orders_pkey{suffix}')
+
+
+def create_indexes() -> None:
+    for name, columns, where in INDEXES:
+        op.create_index(
+            name,
+            'orders',
+            columns,
+            unique=False,
+            postgresql_where=sa.text(where) if where else None,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('orders', 'orders_legacy')
+    rename_indexes('orders_legacy', '_legacy')
+
+    # Первичный ключ обязан включать ключ партиционирования, поэтому
+    # уникальность id на уровне БД теряется: уникальна только пара
+    # (id, created_at). Новые заказы получают UUIDv7 с created_at из id
+    # (helpers.order_ids), для старых UUIDv4 остаётся случайность.
+    op.execute("""
+        CREATE TABLE orders (
+            id uuid DEFAULT gen_random_uuid() NOT NULL,
+            users_id uuid NOT NULL,
+            items jsonb NOT NULL,
+            total_price numeric(12, 2) NOT NULL,
+            status orderstatus NOT NULL,
+            created_at timestamptz DEFAULT now() NOT NULL,
+            CONSTRAINT orders_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT orders_users_id_fkey FOREIGN KEY (users_id) REFERENCES users (id)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    # Страховка на случай, если обслуживание партиций отстало
+    op.execute('CREATE TABLE orders_default PARTITION OF orders DEFAULT')
+
+    first = op.get_bind().scalar(sa.text(
+        "SELECT date_trunc('month', min(created_at) AT TIME ZONE 'UTC') FROM orders_legacy"
+    ))
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = first.date() if first is not None else current
+    last = add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE orders_p{month.year:04d}_{month.month:02d} PARTITION OF orders "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+        )
+        month = add_months(month, 1)
+
+    op.execute(
+        'INSERT INTO orders (id, users_id, items, total_price, status, created_at) '
+        'SELECT id, users_id, items, total_price, status, created_at FROM orders_legacy'
+    )
+    op.drop_table('orders_legacy')
+    # Индексы на родительской таблице создаются во всех партициях, в том числе
+    # будущих
+    create_indexes()
+    op.execute('ANALYZE orders')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('orders', 'orders_partitioned')
+    rename_indexes('orders_partitioned', '_partitioned')
+
+    op.create_table('orders',
+    sa.Column('id', sa.Uuid(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('users_id', sa.Uuid(), nullable=False),
+    sa.Column('items', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('total_price', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDING', 'PAID', 'SHIPPED', 'CANCELED', name='orderstatus', create_type=False), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['users_id'], ['users.id'], name='orders_users_id_fkey'),
+    sa.PrimaryKeyConstraint('id', name='orders_pkey')
+    )
+    op.execute(
+        'INSERT INTO orders (id, users_id, items, total_price, status, created_at) '
+        'SELECT id, users_id, items, total_price, status, created_at FROM orders_partitioned'
+    )
+    # Партиции удаляются вместе с родительской таблицей
+    op.drop_table('orders_partitioned')
+    create_indexes()
+    op.drop_index('ix_orders_id', table_name='orders')
@@ -0,0 +1,29 @@
+"""Модуль описание модели агрегатов заказов по пользователям."""
+
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Enum, ForeignKey, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from helpers.enums import OrderStatus
+from models.base import Base
+
+
+class UserOrderStats(Base):
+    """Количество и сумма заказов пользователя в каждом статусе.
+
+    Строки меняются дельтами в тех же транзакциях, что и заказы.
+    """
+
+    __tablename__ = "user_order_stats"
+
+    users_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), primary_key=True)
+    orders_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    total_price: Mapped[Decimal] = mapped_column(
+        Numeric(precision=14, scale=2), default=0
+    )
+
+    def __repr__(self):
+        return f"Stats of user {self.users_id} for status {self.status}"
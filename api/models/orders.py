@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import TIMESTAMP, Enum, Numeric, ForeignKey, func
+from sqlalchemy import TIMESTAMP, Enum, Numeric, ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import JSONB
 
@@ -13,7 +13,32 @@ from models.base import Base
 
 class Orders(Base):
     __tablename__ = "orders"
+    # Помесячные партиции по created_at, обслуживаются database.partitions
+    __table_args__ = (
+        # Индексы под keyset-пагинацию по (created_at, id)
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index("ix_orders_users_id_created_at_id", "users_id", "created_at", "id"),
+        # Индексы под фильтры списков заказов
+        Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
+        Index(
+            "ix_orders_pending_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        Index("ix_orders_total_price", "total_price"),
+        # Поиск старых заказов (UUIDv4) по id без created_at: по индексу в каждой
+        # партиции
+        Index("ix_orders_id", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
+    # В партиционированной таблице уникальность гарантируется только для
+    # (id, created_at): отдельный уникальный индекс по id Postgres не даёт.
+    # Сервис создаёт UUIDv7 и берёт created_at из id (helpers.order_ids),
+    # так что пара, а значит и id, уникальны. Для строк со случайным
+    # gen_random_uuid() (старые заказы, вставки в обход сервиса) уникальность
+    # id держится только на случайности UUIDv4.
     id: Mapped[UUID] = mapped_column(
         primary_key=True, server_default=func.gen_random_uuid()
     )
@@ -26,8 +51,9 @@ class Orders(Base):
     status: Mapped[OrderStatus] = mapped_column(
         Enum(OrderStatus), default=OrderStatus.PENDING
     )
+    # Ключ партиционирования входит в первичный ключ
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), server_default=func.now()
+        TIMESTAMP(timezone=True), server_default=func.now(), primary_key=True
     )
 
     def __repr__(self):
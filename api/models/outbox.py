@@ -0,0 +1,30 @@
+"""Модуль описание модели исходящих событий (transactional outbox)."""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import TIMESTAMP, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class Outbox(Base):
+    __tablename__ = "outbox"
+
+    id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=func.gen_random_uuid()
+    )
+    exchange: Mapped[str]
+    routing_key: Mapped[str]
+    task_name: Mapped[str]
+    payload: Mapped[dict] = mapped_column(JSONB)
+    # Заголовки W3C Trace Context запроса, создавшего событие
+    trace_context: Mapped[dict | None] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), index=True
+    )
+
+    def __repr__(self):
+        return f"Outbox event {self.id} ({self.task_name})"
@@ -1,55 +1,266 @@
 """модуль работы с RMQ"""
 
-from typing import TYPE_CHECKING
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Iterable
 from aio_pika import ExchangeType, DeliveryMode, Message, connect_robust
+from opentelemetry.propagate import extract, inject
+from opentelemetry.trace import SpanKind
 
-from helpers.logger import logger
+from helpers.metrics import RMQ_PUBLISH_DURATION, timed
+from helpers.tracing import tracer
 
 if TYPE_CHECKING:
     from aio_pika import RobustConnection
+    from aio_pika.abc import AbstractChannel, AbstractExchange
+
+    _Pending = tuple[str, str, Message, asyncio.Future]
+
+# Отдельный логгер для выборки записей горячего пути (LOG_SAMPLE_RATES)
+logger = logging.getLogger(__name__)
 
 
 class RMQClient:
     def __init__(self):
         self._connection: "RobustConnection" = None
+        # Пул постоянных каналов публикации с подтверждениями
+        self._channels: asyncio.Queue["AbstractChannel"] = asyncio.Queue()
+        # Объекты обменников, закэшированные на каждый канал пула
+        self._exchanges: dict["AbstractChannel", dict[str, "AbstractExchange"]] = {}
+        # Уже объявленные пары (обменник, очередь)
+        self._declared: set[tuple[str, str]] = set()
+        # Буфер пакетного режима: (обменник, ключ, сообщение, future вызывающего)
+        self._buffer: "asyncio.Queue[_Pending] | None" = None
+        self._flusher: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def connect(
+        self,
+        rmq_url: str,
+        bindings: Iterable[tuple[str, str]] = (),
+        pool_size: int = 4,
+        **kwargs,
+    ) -> "RobustConnection":
+        """Метод подключения к RMQ серверу.
 
-    async def connect(self, rmq_url: str, **kwargs) -> "RobustConnection":
-        """Метод подключения к RMQ серверу."""
+        Открывает соединение, объявляет топологию и заполняет пул каналов.
+
+        Args:
+            rmq_url (str): URL подключения
+            bindings (Iterable[tuple[str, str]]): Пары (обменник, очередь) для объявления
+            pool_size (int): Количество постоянных каналов публикации
+        """
         self._connection = await connect_robust(rmq_url, **kwargs)
+        for exchange_name, queue_name in bindings:
+            await self.declare(exchange_name, queue_name)
+        for _ in range(pool_size):
+            channel = await self._connection.channel(publisher_confirms=True)
+            self._exchanges[channel] = {}
+            self._channels.put_nowait(channel)
         logger.info("Connected to RMQ")
         return self._connection
 
-    async def send_message(
-        self, exchange_name: str, queue_name: str, message: str, task_name: str
-    ):
-        """Метод отправки сообщений в RMQ по переданным параметрам
+    async def declare(self, exchange_name: str, queue_name: str) -> None:
+        """Метод объявления обменника, очереди и их связки.
+
+        Выполняется один раз на пару, на отдельном служебном канале.
 
         Args:
             exchange_name (str): Название обменника
             queue_name (str): Название очереди
-            message (str): Содержание сообщений в формате json
-            task_name (Str): Название задачи по event-bus
         """
-        async with self._connection:
-            channel = await self._connection.channel()
-
+        if (exchange_name, queue_name) in self._declared:
+            return
+        async with self._connection.channel() as channel:
             exchange = await channel.declare_exchange(
                 name=exchange_name, type=ExchangeType.DIRECT, durable=True
             )
             queue = await channel.declare_queue(name=queue_name, durable=True)
             await queue.bind(exchange, routing_key=queue_name)
+        self._declared.add((exchange_name, queue_name))
+
+    @asynccontextmanager
+    async def _acquire_channel(self) -> AsyncIterator["AbstractChannel"]:
+        """Метод получения канала из пула на время публикации."""
+        channel = await self._channels.get()
+        try:
+            yield channel
+        finally:
+            self._channels.put_nowait(channel)
+
+    async def _get_exchange(
+        self, channel: "AbstractChannel", exchange_name: str
+    ) -> "AbstractExchange":
+        """Метод получения закэшированного объекта обменника для канала.
+
+        Обменник уже объявлен в declare, поэтому объект создаётся без
+        обращения к серверу (ensure=False).
+        """
+        exchanges = self._exchanges[channel]
+        exchange = exchanges.get(exchange_name)
+        if exchange is None:
+            exchange = await channel.get_exchange(exchange_name, ensure=False)
+            exchanges[exchange_name] = exchange
+        return exchange
+
+    def enable_batching(
+        self, batch_size: int = 100, linger_ms: int = 5, buffer_size: int = 10000
+    ) -> None:
+        """Метод включения пакетного режима публикации.
+
+        send_message кладёт сообщение в ограниченный буфер и ждёт своего
+        подтверждения. Фоновая задача забирает до batch_size сообщений (или всё,
+        что накопилось за linger_ms), публикует их одной пачкой на канале из пула
+        и ожидает все подтверждения разом. При заполненном буфере вызывающие
+        ждут освобождения места.
+
+        Args:
+            batch_size (int): Максимальный размер пачки
+            linger_ms (int): Максимальное ожидание добора пачки в миллисекундах
+            buffer_size (int): Вместимость буфера
+        """
+        self._buffer = asyncio.Queue(maxsize=buffer_size)
+        self._flusher = asyncio.create_task(
+            self._flush_loop(batch_size, linger_ms / 1000), name="rmq-batch-flusher"
+        )
+        logger.info(f"RMQ batching enabled: size={batch_size}, linger={linger_ms}ms")
+
+    async def _flush_loop(self, batch_size: int, linger: float) -> None:
+        """Цикл сборки пачек из буфера."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._buffer.get()]
+            deadline = loop.time() + linger
+            while len(batch) < batch_size:
+                if not self._buffer.empty():
+                    batch.append(self._buffer.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._buffer.get(), timeout))
+                except TimeoutError:
+                    break
+            # Одновременно в полёте не больше пачек, чем каналов в пуле
+            channel = await self._channels.get()
+            task = asyncio.create_task(self._flush(channel, batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, channel: "AbstractChannel", batch: list["_Pending"]) -> None:
+        """Метод публикации пачки с общим ожиданием подтверждений.
+
+        Обменники получаются до создания корутин публикации, поэтому ошибка
+        не оставляет неожиданных корутин. Любая ошибка, в том числе отмена,
+        передаётся всем ожидающим сообщениям пачки.
+        """
+        try:
+            exchanges = [
+                await self._get_exchange(channel, exchange_name)
+                for exchange_name, *_ in batch
+            ]
+            results = await asyncio.gather(
+                *(
+                    exchange.publish(message, routing_key=routing_key)
+                    for exchange, (_, routing_key, message, _) in zip(exchanges, batch)
+                ),
+                return_exceptions=True,
+            )
+        except asyncio.CancelledError:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("RMQ batch publish cancelled"))
+            raise
+        except Exception as e:
+            results = [e] * len(batch)
+        finally:
+            self._channels.put_nowait(channel)
+
+        for (*_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @timed(RMQ_PUBLISH_DURATION)
+    async def send_message(
+        self,
+        exchange_name: str,
+        queue_name: str,
+        message: str,
+        task_name: str,
+        trace_context: dict[str, str] | None = None,
+    ):
+        """Метод отправки сообщений в RMQ по переданным параметрам
+
+        Args:
+            exchange_name (str): Название обменника
+            queue_name (str): Название очереди
+            message (str): Содержание сообщений в формате json
+            task_name (Str): Название задачи по event-bus
+            trace_context (dict[str, str] | None): Контекст трассировки операции,
+                породившей сообщение (например, сохранённый в outbox);
+                по умолчанию текущий span
+        """
+        await self.declare(exchange_name, queue_name)
+        with tracer.start_as_current_span(
+            f"{exchange_name} publish",
+            context=extract(trace_context) if trace_context else None,
+            kind=SpanKind.PRODUCER,
+            attributes={
+                "messaging.system": "rabbitmq",
+                "messaging.operation.type": "send",
+                "messaging.destination.name": exchange_name,
+                "messaging.rabbitmq.destination.routing_key": queue_name,
+            },
+        ):
+            headers = {"task_name": task_name, "content-type": "application/json"}
+            # Span публикации продолжается консюмером по заголовку traceparent
+            inject(headers)
             message = Message(
                 body=message.encode(),
                 delivery_mode=DeliveryMode.PERSISTENT,
-                headers={"task_name": task_name, "content-type": "application/json"},
+                headers=headers,
             )
-            await exchange.publish(message, routing_key=queue_name)
-            logger.info(f"Message sent to {exchange_name}-{queue_name}")
+            if self._buffer is not None:
+                future = asyncio.get_running_loop().create_future()
+                await self._buffer.put((exchange_name, queue_name, message, future))
+                await future
+            else:
+                async with self._acquire_channel() as channel:
+                    exchange = await self._get_exchange(channel, exchange_name)
+                    await exchange.publish(message, routing_key=queue_name)
+        logger.info("Message sent to %s-%s", exchange_name, queue_name)
+
+    async def _stop_batching(self) -> None:
+        """Метод остановки пакетного режима.
+
+        Пачки в полёте дожидаются подтверждений, сообщения, оставшиеся
+        в буфере, завершаются ошибкой.
+        """
+        if self._flusher is None:
+            return
+        self._flusher.cancel()
+        await asyncio.gather(self._flusher, *self._flushes, return_exceptions=True)
+        while not self._buffer.empty():
+            *_, future = self._buffer.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("RMQ client disconnected"))
+        self._buffer = None
+        self._flusher = None
 
     async def disconnect(self):
         """Метод закрытия соединения."""
+        await self._stop_batching()
         if self._connection:
             await self._connection.close()
+        self._channels = asyncio.Queue()
+        self._exchanges.clear()
+        self._declared.clear()
         logger.info("RMQ disconnected")
 
 
@@ -0,0 +1,105 @@
+"""Модуль ретрансляции событий из таблицы outbox в RMQ."""
+
+import asyncio
+
+import orjson
+
+from configs import settings
+from database.connection import async_session_maker
+from database.query import delete_outbox_events, get_outbox_batch
+from helpers.logger import logger
+from models.outbox import Outbox
+from rabbit_core.client import RMQClient, rmq_client
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        client: RMQClient = rmq_client,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+    ):
+        self.client = client
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Метод запуска фоновой задачи ретрансляции."""
+        self._task = asyncio.create_task(self._run(), name="outbox-relay")
+        logger.info("Outbox relay started")
+
+    async def stop(self) -> None:
+        """Метод остановки фоновой задачи ретрансляции."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Outbox relay stopped")
+
+    def notify(self) -> None:
+        """Метод пробуждения ретранслятора после записи нового события."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Цикл ретрансляции: пачки подряд, пока таблица не опустеет, затем ожидание."""
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception as e:
+                logger.error(f"Outbox relay error: {e}")
+                relayed = 0
+            if relayed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def _publish(self, event: Outbox) -> None:
+        """Метод публикации одного события с ожиданием подтверждения брокера."""
+        await self.client.send_message(
+            exchange_name=event.exchange,
+            queue_name=event.routing_key,
+            message=orjson.dumps(event.payload).decode(),
+            task_name=event.task_name,
+            trace_context=event.trace_context,
+        )
+
+    async def relay_batch(self) -> int:
+        """Метод отправки одной пачки событий.
+
+        Пачка захватывается FOR UPDATE SKIP LOCKED, поэтому несколько реплик API
+        разбирают таблицу параллельно без повторной отправки. Удаляются только
+        события, для которых получено подтверждение; остальные вернутся
+        в следующей пачке.
+
+        Returns:
+            int: Количество отправленных событий
+        """
+        async with async_session_maker() as async_session:
+            events = await get_outbox_batch(async_session, self.batch_size)
+            if not events:
+                return 0
+            results = await asyncio.gather(
+                *(self._publish(event) for event in events), return_exceptions=True
+            )
+            sent = []
+            for event, result in zip(events, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to relay outbox event {event.id}: {result}")
+                else:
+                    sent.append(event.id)
+            await delete_outbox_events(async_session, sent)
+            await async_session.commit()
+            return len(sent)
+
+
+outbox_relay = OutboxRelay(
+    batch_size=settings.OUTBOX_BATCH_SIZE, poll_interval=settings.OUTBOX_POLL_INTERVAL
+)
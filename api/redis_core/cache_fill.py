@@ -0,0 +1,346 @@
+"""Модуль заполнения кэша без лавины запросов в БД при истечении ключа."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+import orjson
+from redis.exceptions import RedisError
+
+from configs import settings
+from helpers.metrics import CACHE_REQUESTS
+from helpers.orjson_coder import ORJsonCoder
+from helpers.ttl_cache import TTLCache
+from redis_core.client import RedisClient, redis_client
+from redis_core.single_flight import SingleFlight
+
+Loader = Callable[[], Awaitable[dict | bytes | None]]
+
+
+class CacheFillTimeout(TimeoutError):
+    """Значение заполняет другая реплика, и оно не появилось за время ожидания."""
+
+
+class CacheFiller:
+    """
+    Чтение ключа из Redis с заполнением при промахе.
+
+    - внутри процесса одновременные промахи по ключу объединяются (SingleFlight);
+    - между репликами заполнение выполняет владелец блокировки в Redis,
+      остальные ждут появления значения;
+    - за early_refresh секунд до истечения одна реплика обновляет значение
+      в фоне, а запросы продолжают получать текущее;
+    - перед Redis стоит ближний кэш процесса (near) с коротким TTL, изменения
+      рассылаются репликам через pub/sub, так что устаревшее значение живёт
+      не дольше near TTL даже при потере сообщения;
+    - set и evict увеличивают версию ключа, а загруженное значение пишется
+      в Redis, только если версия не менялась с начала загрузки: заполнение,
+      прочитавшее строку до изменения, не перезапишет новое значение.
+    """
+
+    lock_prefix = "lock:"
+    version_prefix = "version:"
+    # Версия должна пережить самую долгую загрузку
+    version_expire_ms = 3_600_000
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        lock_ttl_ms: int = 5000,
+        lock_wait_ms: int = 2000,
+        lock_poll_ms: int = 20,
+        early_refresh: int = 3,
+        near_size: int = 1024,
+        near_ttl: float = 2.0,
+        invalidation_channel: str = "cache:invalidate",
+        name: str = "default",
+    ):
+        self.redis = redis
+        self.lock_ttl_ms = lock_ttl_ms
+        self.lock_wait = lock_wait_ms / 1000
+        self.lock_poll = lock_poll_ms / 1000
+        self.early_refresh = early_refresh
+        self._flight = SingleFlight()
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self.near = TTLCache(maxsize=near_size, ttl=near_ttl)
+        self.invalidation_channel = invalidation_channel
+        self._listener: asyncio.Task | None = None
+        self.redis_hits = 0
+        self.redis_misses = 0
+        # Счётчики Prometheus связываются с метками один раз
+        self._near_hit = CACHE_REQUESTS.labels(name, "near", "hit")
+        self._near_miss = CACHE_REQUESTS.labels(name, "near", "miss")
+        self._redis_hit = CACHE_REQUESTS.labels(name, "redis", "hit")
+        self._redis_miss = CACHE_REQUESTS.labels(name, "redis", "miss")
+
+    def stats(self) -> dict:
+        """Метод получения статистики попаданий по уровням кэша."""
+        redis_total = self.redis_hits + self.redis_misses
+        listener = self._listener
+        return {
+            "listener": "stopped"
+            if listener is None
+            else "running"
+            if not listener.done()
+            else "dead",
+            "near": {
+                "hits": self.near.hits,
+                "misses": self.near.misses,
+                "hit_ratio": round(self.near.hit_ratio, 4),
+                "size": len(self.near),
+            },
+            "redis": {
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "hit_ratio": round(self.redis_hits / redis_total, 4)
+                if redis_total
+                else 0.0,
+            },
+        }
+
+    async def get(self, key: str, loader: Loader, expire: int) -> bytes | None:
+        """
+        Метод получения значения по ключу.
+
+        Args:
+            key (str): Уникальный ключ
+            loader (Loader): Загрузка значения из источника; None если его нет.
+                Вызов может быть общим для нескольких запросов, поэтому loader
+                не должен использовать сессию БД конкретного запроса.
+            expire (int): Время хранения в кэше (в сек)
+
+        Returns:
+            bytes | None: Значение в формате json либо None, если его нет в источнике
+        """
+        data = self.near.get(key)
+        if data is not None:
+            self._near_hit.inc()
+            return data
+        self._near_miss.inc()
+
+        ttl, data = await self.redis.check_cache(key)
+        if data:
+            self.redis_hits += 1
+            self._redis_hit.inc()
+            if ttl > 0:
+                self.near.set(key, data, min(self.near.ttl, ttl))
+            if 0 < ttl <= self.early_refresh:
+                self._refresh_in_background(key, loader, expire)
+            return data
+
+        self.redis_misses += 1
+        self._redis_miss.inc()
+        data = await self._flight.do(key, lambda: self._fill(key, loader, expire))
+        if data is not None:
+            self.near.set(key, data)
+        return data
+
+    async def set(self, key: str, value: dict | bytes, expire: int) -> None:
+        """
+        Метод записи нового значения после изменения источника.
+        Значение пишется в Redis до рассылки, поэтому реплики, сбросившие
+        ближний кэш, сразу читают новое.
+
+        Args:
+            key (str): Уникальный ключ
+            value (dict | bytes): Новое значение
+            expire (int): Время хранения в кэше (в сек)
+        """
+        data = value if isinstance(value, bytes) else ORJsonCoder.encode(value)
+        await self.redis.set_versioned(
+            key, data, expire, self.version_prefix + key, self.version_expire_ms
+        )
+        await self.invalidate(key)
+
+    async def invalidate(self, *keys: str) -> None:
+        """
+        Метод сброса ключей из ближних кэшей всех реплик.
+
+        Args:
+            keys (str): Уникальные ключи
+        """
+        for key in keys:
+            self.near.pop(key)
+        await self.redis.publish(self.invalidation_channel, orjson.dumps(keys))
+
+    async def evict(self, *keys: str) -> None:
+        """
+        Метод удаления ключей из Redis и ближних кэшей всех реплик
+        за один запрос в Redis.
+
+        Args:
+            keys (str): Уникальные ключи
+        """
+        if not keys:
+            return
+        for key in keys:
+            self.near.pop(key)
+        await self.redis.delete_and_publish(
+            list(keys),
+            self.invalidation_channel,
+            orjson.dumps(keys),
+            version_keys=[self.version_prefix + key for key in keys],
+            version_expire_ms=self.version_expire_ms,
+        )
+
+    def start_listener(self) -> None:
+        """Метод запуска подписки на сообщения инвалидации."""
+        self._listener = asyncio.create_task(
+            self._listen(), name="cache-invalidation-listener"
+        )
+        self._listener.add_done_callback(self._listener_done)
+
+    def _listener_done(self, task: asyncio.Task) -> None:
+        """Метод сообщения о завершении подписки не через stop_listener."""
+        if task.cancelled():
+            return
+        logging.error(
+            "Cache invalidation listener died, near cache is no longer invalidated",
+            exc_info=task.exception(),
+        )
+
+    async def stop_listener(self) -> None:
+        """Метод остановки подписки на сообщения инвалидации."""
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    def _invalidate_message(self, message: dict) -> None:
+        """Метод сброса ключей из сообщения; битое сообщение пропускается."""
+        try:
+            keys = orjson.loads(message["data"])
+            if not isinstance(keys, list):
+                raise TypeError(f"expected list of keys, got {type(keys).__name__}")
+            for key in keys:
+                self.near.pop(key)
+        except Exception as e:
+            logging.warning(f"Skipping malformed cache invalidation message: {e}")
+
+    async def _listen(self) -> None:
+        """
+        Цикл обработки сообщений инвалидации с переподключением.
+        Ошибка разбора сообщения пропускает только это сообщение, ошибка
+        соединения ведёт к переподключению с нарастающей паузой (до 30 с).
+        """
+        delay = 1
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                # Пока подписки не было, сообщения могли быть пропущены
+                self.near.clear()
+                delay = 1
+                async for message in pubsub.listen():
+                    self._invalidate_message(message)
+            except (RedisError, OSError) as e:
+                logging.warning(f"Cache invalidation listener error: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                await pubsub.aclose()
+
+    async def _fill(self, key: str, loader: Loader, expire: int) -> bytes | None:
+        """
+        Метод заполнения ключа при промахе.
+        Загружает значение только владелец блокировки. Если блокировку сняли
+        без значения (например, записи нет в БД), ожидавший загружает сам.
+        Если значение не появилось за lock_wait, блокировка берётся ещё раз,
+        а при повторной неудаче запрос завершается CacheFillTimeout, чтобы
+        ожидавшие не пошли в источник все разом.
+
+        Raises:
+            CacheFillTimeout: Значение не появилось и после повторной попытки
+        """
+        lock_key = self.lock_prefix + key
+        for _ in range(2):
+            token = await self.redis.acquire_lock(lock_key, self.lock_ttl_ms)
+            if token is None:
+                data, locked = await self._wait_for_value(key, lock_key)
+                if data is not None:
+                    return data
+                if locked:
+                    continue
+            try:
+                return await self._load(key, loader, expire)
+            finally:
+                if token is not None:
+                    await self.redis.release_lock(lock_key, token)
+        raise CacheFillTimeout(f"Cache fill of {key} timed out")
+
+    async def _wait_for_value(
+        self, key: str, lock_key: str
+    ) -> tuple[bytes | None, bool]:
+        """Метод ожидания значения, которое заполняет другая реплика.
+
+        Ожидание прекращается, когда значение появилось, блокировка снята без
+        значения (например, записи нет в БД) или истекло lock_wait.
+
+        Returns:
+            tuple[bytes | None, bool]: Значение + признак, что блокировка
+                всё ещё занята (ожидание истекло)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_wait
+        while loop.time() < deadline:
+            await asyncio.sleep(self.lock_poll)
+            data, locked = await self.redis.check_cache_and_lock(key, lock_key)
+            if data or not locked:
+                return data or None, False
+        return None, True
+
+    async def _load(self, key: str, loader: Loader, expire: int) -> bytes | None:
+        """
+        Метод загрузки значения из источника и записи в кэш.
+        Версия ключа читается до загрузки: если за время загрузки ключ изменили
+        или удалили, загруженное значение в Redis не пишется и возвращается
+        то, что лежит там сейчас (или загруженное, если ключ удалён).
+        """
+        version_key = self.version_prefix + key
+        version = await self.redis.get_version(version_key)
+        value = await loader()
+        if value is None:
+            return None
+        data = value if isinstance(value, bytes) else ORJsonCoder.encode(value)
+        current = await self.redis.set_if_version(
+            key, version_key, version, data, expire
+        )
+        return current or data
+
+    def _refresh_in_background(self, key: str, loader: Loader, expire: int) -> None:
+        """Метод фонового обновления ключа до его истечения."""
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            lock_key = self.lock_prefix + key
+            token = await self.redis.acquire_lock(lock_key, self.lock_ttl_ms)
+            if token is None:
+                return
+            try:
+                await self._load(key, loader, expire)
+            except Exception as e:
+                logging.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                await self.redis.release_lock(lock_key, token)
+
+        task = asyncio.create_task(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+
+order_cache = CacheFiller(
+    redis_client,
+    lock_ttl_ms=settings.CACHE_LOCK_TTL_MS,
+    lock_wait_ms=settings.CACHE_LOCK_WAIT_MS,
+    lock_poll_ms=settings.CACHE_LOCK_POLL_MS,
+    early_refresh=settings.CACHE_EARLY_REFRESH_SECONDS,
+    near_size=settings.NEAR_CACHE_SIZE,
+    near_ttl=settings.NEAR_CACHE_TTL,
+    invalidation_channel=settings.CACHE_INVALIDATION_CHANNEL,
+    name="orders",
+)
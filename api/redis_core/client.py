@@ -1,9 +1,28 @@
 """Модуль работы с Redis."""
+from uuid import uuid4
+
 from redis import asyncio as aioredis
 from redis.exceptions import NoScriptError
 import logging
 
+from helpers.metrics import REDIS_COMMAND_DURATION, timed
 from helpers.orjson_coder import ORJsonCoder
+from helpers.tracing import traced
+from redis_core.lua_script import RELEASE_LOCK, SET_IF_VERSION
+
+# Отдельный логгер для выборки записей горячего пути (LOG_SAMPLE_RATES)
+logger = logging.getLogger(__name__)
+
+
+def instrumented(operation: str):
+    """Декоратор замера времени и трассировки операции RedisClient."""
+    attributes = {"db.system.name": "redis", "db.operation.name": operation}
+
+    def decorator(func):
+        func = traced(f"redis {operation}", attributes)(func)
+        return timed(REDIS_COMMAND_DURATION, operation=operation)(func)
+
+    return decorator
 
 
 class RedisClient:
@@ -19,35 +38,37 @@ class RedisClient:
         self.pool = aioredis.ConnectionPool().from_url(redis_url)
         self.redis = aioredis.Redis.from_pool(self.pool)
         if await self.redis.ping():
-            logging.info("Redis connected")
+            logger.info("Redis connected")
             return True
-        logging.warning("Cannot connect to Redis")
+        logger.warning("Cannot connect to Redis")
         return False
 
-    async def add_to_cache(self, key: str, value: dict, expire: int) -> bool:
+    @instrumented("add_to_cache")
+    async def add_to_cache(self, key: str, value: dict | bytes, expire: int) -> bool:
         """Метод добавления данных в кэш.
 
         Args:
             key (str): Уникальный ключ
-            value (dict): значение ключа
+            value (dict | bytes): значение ключа, bytes сохраняются как есть
             expire (int): Время истечения хранения кэша (в сек)
 
         Returns:
             bool: True если сохранено, иначе False
         """
         try:
-            response_data = ORJsonCoder.encode(value)
+            response_data = value if isinstance(value, bytes) else ORJsonCoder.encode(value)
         except TypeError:
             message = f"Object of type {type(value)} is not JSON-serializable"
-            logging.error(message)
+            logger.error(message)
             return False
         cached = await self.redis.set(name=key, value=response_data, ex=expire)
         if cached:
-            logging.info(f"{key} added to cache")
+            logger.info("%s added to cache", key)
         else:
-            logging.warning(f"Failed to cache key {key}")
+            logger.warning("Failed to cache key %s", key)
         return cached
 
+    @instrumented("check_cache")
     async def check_cache(self, key: str) -> tuple[int, str]:
         """Метод проверки наличие кэша по ключу
 
@@ -60,14 +81,195 @@ class RedisClient:
         async with self.redis.pipeline() as pipe:
             ttl, in_cache = await pipe.ttl(key).get(key).execute()
             if in_cache:
-                logging.info(f"Key {key} found in cache")
+                logger.info("Key %s found in cache", key)
             return ttl, in_cache
 
+    @instrumented("acquire_lock")
+    async def acquire_lock(self, key: str, expire_ms: int) -> str | None:
+        """Метод взятия распределённой блокировки (SET NX PX).
+
+        Args:
+            key (str): Ключ блокировки
+            expire_ms (int): Время автоматического снятия блокировки (в мс)
+
+        Returns:
+            str | None: Токен владельца, если блокировка взята, иначе None
+        """
+        token = uuid4().hex
+        if await self.redis.set(name=key, value=token, nx=True, px=expire_ms):
+            return token
+        return None
+
+    @instrumented("release_lock")
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Метод снятия блокировки, если она всё ещё принадлежит владельцу токена.
+
+        Args:
+            key (str): Ключ блокировки
+            token (str): Токен из acquire_lock
+
+        Returns:
+            bool: True если блокировка снята
+        """
+        return bool(await self.redis.eval(RELEASE_LOCK, 1, key, token))
+
+    @instrumented("get_version")
+    async def get_version(self, key: str) -> bytes:
+        """Метод чтения версии значения перед его загрузкой из источника.
+
+        Args:
+            key (str): Ключ версии
+
+        Returns:
+            bytes: Версия, пустая строка если ключа версии нет
+        """
+        return await self.redis.get(key) or b""
+
+    @instrumented("set_if_version")
+    async def set_if_version(
+        self, key: str, version_key: str, version: bytes, value: bytes, expire: int
+    ) -> bytes | None:
+        """Метод записи значения, если его версия не менялась (атомарно).
+
+        Args:
+            key (str): Уникальный ключ
+            version_key (str): Ключ версии
+            version (bytes): Версия из get_version до загрузки значения
+            value (bytes): Значение
+            expire (int): Время истечения хранения кэша (в сек)
+
+        Returns:
+            bytes | None: Значение, которое лежит в Redis после вызова
+        """
+        return await self.redis.eval(
+            SET_IF_VERSION, 2, key, version_key, version, value, expire
+        )
+
+    @instrumented("set_versioned")
+    async def set_versioned(
+        self,
+        key: str,
+        value: bytes,
+        expire: int,
+        version_key: str,
+        version_expire_ms: int,
+    ) -> None:
+        """Метод записи значения с увеличением его версии за один запрос.
+
+        Args:
+            key (str): Уникальный ключ
+            value (bytes): Значение
+            expire (int): Время истечения хранения кэша (в сек)
+            version_key (str): Ключ версии
+            version_expire_ms (int): Время жизни версии (в мс)
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(name=key, value=value, ex=expire)
+            pipe.incr(version_key).pexpire(version_key, version_expire_ms)
+            await pipe.execute()
+
+    @instrumented("check_cache_and_lock")
+    async def check_cache_and_lock(
+        self, key: str, lock_key: str
+    ) -> tuple[bytes | None, bool]:
+        """Метод проверки значения и блокировки его заполнения за один запрос.
+
+        Args:
+            key (str): Уникальный ключ
+            lock_key (str): Ключ блокировки
+
+        Returns:
+            tuple[bytes | None, bool]: Значение + признак занятой блокировки
+        """
+        async with self.redis.pipeline() as pipe:
+            in_cache, locked = await pipe.get(key).exists(lock_key).execute()
+            return in_cache, bool(locked)
+
+    @instrumented("publish")
+    async def publish(self, channel: str, message: bytes | str) -> int:
+        """Метод публикации сообщения в канал pub/sub.
+
+        Args:
+            channel (str): Название канала
+            message (bytes | str): Сообщение
+
+        Returns:
+            int: Количество получивших подписчиков
+        """
+        return await self.redis.publish(channel, message)
+
+    @instrumented("delete_and_publish")
+    async def delete_and_publish(
+        self,
+        keys: list[str],
+        channel: str,
+        message: bytes | str,
+        version_keys: list[str] | None = None,
+        version_expire_ms: int = 0,
+    ) -> int:
+        """Метод удаления ключей и публикации сообщения за один запрос (pipeline).
+
+        Args:
+            keys (list[str]): Уникальные ключи
+            channel (str): Название канала
+            message (bytes | str): Сообщение
+            version_keys (list[str]): Ключи версий, увеличиваемых до публикации
+            version_expire_ms (int): Время жизни версий (в мс)
+
+        Returns:
+            int: Количество удалённых ключей
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            for version_key in version_keys or ():
+                pipe.incr(version_key).pexpire(version_key, version_expire_ms)
+            pipe.publish(channel, message)
+            deleted, *_ = await pipe.execute()
+            return deleted
+
+    def pubsub(self) -> aioredis.client.PubSub:
+        """Метод получения объекта подписки pub/sub на общем пуле соединений."""
+        return self.redis.pubsub(ignore_subscribe_messages=True)
+
+    @instrumented("delete")
+    async def delete(self, *keys: str) -> int:
+        """Метод удаления ключей из кэша.
+
+        Args:
+            keys (str): Уникальные ключи
+
+        Returns:
+            int: Количество удалённых ключей
+        """
+        return await self.redis.delete(*keys)
+
+    @instrumented("set_flag")
+    async def set_flag(self, key: str, expire_ms: int) -> None:
+        """Метод установки флага-метки с временем жизни.
+
+        Args:
+            key (str): Уникальный ключ
+            expire_ms (int): Время жизни в миллисекундах
+        """
+        await self.redis.set(name=key, value=b"1", px=expire_ms)
+
+    @instrumented("exists")
+    async def exists(self, key: str) -> bool:
+        """Метод проверки наличия ключа.
+
+        Args:
+            key (str): Уникальный ключ
+
+        Returns:
+            bool: True если ключ существует
+        """
+        return bool(await self.redis.exists(key))
+
     async def disconnect(self):
         """Метод закрытыя соединения с Redis"""
         if await self.redis.ping():
             await self.redis.aclose()
-            logging.info("Redis disconnected")
+            logger.info("Redis disconnected")
         return None
 
     @staticmethod
@@ -89,6 +291,7 @@ class RedisClient:
         """
         return await self.redis.script_load(script)
 
+    @instrumented("evaluate_sha")
     async def evaluate_sha(self, sha: str, keys_len: int, values=None):
         if values is None:
             values = []
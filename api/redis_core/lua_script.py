@@ -14,3 +14,23 @@ if request_count < tonumber(ARGV[2]) then
 end
 return 1      
 """
+
+# Снятие блокировки только её владельцем (сравнение токена и удаление атомарно)
+RELEASE_LOCK: Final[str] = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Запись значения, загруженного из источника, только если версия ключа не
+# менялась с начала загрузки (set/evict увеличивают её). Возвращает значение,
+# которое теперь лежит в Redis (nil, если ключ удалён после начала загрузки).
+SET_IF_VERSION: Final[str] = """
+local current = redis.call('GET', KEYS[2]) or ''
+if current ~= ARGV[1] then
+    return redis.call('GET', KEYS[1])
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return ARGV[2]
+"""
@@ -1,11 +1,23 @@
+import asyncio
+import hashlib
 import re
-from typing import Any, Final
+from time import monotonic, perf_counter
+from typing import Any, Final, Literal
 from fastapi import Request, HTTPException, status
+from redis.exceptions import RedisError
 
+from configs import settings
+from helpers.logger import logger
+from helpers.metrics import RATE_LIMIT_CHECK_DURATION
+from helpers.ttl_cache import TTLCache
 from redis_core.client import redis_client, RedisClient, NoScriptError
 from redis_core.lua_script import SLIDING_WINDOW_COUNTER
 
 PATTERN: Final[str] = "(\d+)\/((\d+)(s|m|h))+"
+RATE_LIMIT_TIMERS: Final = {
+    backend: RATE_LIMIT_CHECK_DURATION.labels(backend)
+    for backend in ("redis", "fallback")
+}
 
 
 class BaseRateLimiterException(Exception):
@@ -30,6 +42,12 @@ class LimitRuleException(BaseRateLimiterException):
         self.msg = "Limit value must be greater than 1."
 
 
+class DurationRuleException(BaseRateLimiterException):
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
+        self.msg = "Duration value must be greater than 0."
+
+
 def retrieve_rule(rule: str):
     """Функция вычисления правил работы с Limit."""
     try:
@@ -41,8 +59,11 @@ def retrieve_rule(rule: str):
     except re.error, AttributeError, ValueError:
         raise RetrieveRuleException
 
-    if limit < 1 or duration < 0:
+    if limit < 1:
         raise LimitRuleException
+    # Нулевое окно не ограничивает ничего, а token bucket делит на него
+    if duration < 1:
+        raise DurationRuleException
 
     duration_in_s = duration  # second
     if period == "m":
@@ -52,6 +73,38 @@ def retrieve_rule(rule: str):
     return limit, duration_in_s
 
 
+async def load_scripts(redis: RedisClient = redis_client) -> None:
+    """Функция загрузки Lua-скриптов лимитера в Redis при старте сервиса."""
+    await redis.load_script(SLIDING_WINDOW_COUNTER)
+
+
+class LocalTokenBucket:
+    """Token bucket в памяти процесса, используется пока Redis недоступен."""
+
+    def __init__(self, limit: int, duration_in_second: int, max_keys: int):
+        if duration_in_second <= 0:
+            raise ValueError("duration_in_second must be greater than 0")
+        self.capacity = limit
+        self.rate = limit / duration_in_second
+        # За duration бездействия корзина наполняется полностью, дольше хранить незачем
+        self._buckets = TTLCache(maxsize=max_keys, ttl=duration_in_second)
+
+    def consume(self, key: str) -> bool:
+        """Метод списания одного токена по ключу.
+
+        Returns:
+            bool: True если запрос укладывается в лимит
+        """
+        now = monotonic()
+        tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets.set(key, (tokens, now))
+        return allowed
+
+
 class RateLimiter:
     def __init__(
         self,
@@ -60,6 +113,11 @@ class RateLimiter:
         exception_status: int = status.HTTP_429_TOO_MANY_REQUESTS,
         redis: RedisClient = redis_client,
         lua_script: str = SLIDING_WINDOW_COUNTER,
+        failure_policy: Literal["local", "open", "closed"] = (
+            settings.RATE_LIMIT_FAILURE_POLICY
+        ),
+        redis_timeout_ms: int = settings.RATE_LIMIT_REDIS_TIMEOUT_MS,
+        cooldown: float = settings.RATE_LIMIT_COOLDOWN_SECONDS,
     ) -> None:
         (
             self.limit,  # count requests in duration time
@@ -67,10 +125,18 @@ class RateLimiter:
         ) = retrieve_rule(rule)
         self.exp_message = exception_message
         self.exp_status = exception_status
-        if redis_client:
-            self.redis_client = redis
+        self.redis_client = redis
         self.lua_script = lua_script
-        self.lua_sha = ""
+        # SHA совпадает с результатом SCRIPT LOAD, скрипт загружается при старте
+        self.lua_sha = hashlib.sha1(lua_script.encode()).hexdigest()
+        self.failure_policy = failure_policy
+        self.redis_timeout = redis_timeout_ms / 1000
+        self.cooldown = cooldown
+        # До этого момента Redis считается недоступным и не опрашивается
+        self._redis_down_until = 0.0
+        self.local_bucket = LocalTokenBucket(
+            self.limit, self.duration_in_second, settings.RATE_LIMIT_LOCAL_MAX_KEYS
+        )
 
     @staticmethod
     def req_key_builder(req: Request):
@@ -83,18 +149,54 @@ class RateLimiter:
             self.lua_sha, 1, [key, self.duration_in_second, self.limit]
         )
 
-    async def __call__(self, request: Request) -> Any:
-        """Метод вызова Depends для проверки IP адреса на лимит по запросам."""
-        if not await self.redis_client.ping():
-            raise RedisUnavailableException
+    async def check_redis(self, key: str) -> bool:
+        """Проверка Limit в Redis за один EVALSHA.
 
-        key = self.req_key_builder(request)
+        Скрипт перезагружается, только если Redis его потерял (перезапуск).
+        """
         try:
             is_valid = await self.check(key)
         except NoScriptError:
             self.lua_sha = await self.redis_client.load_script(self.lua_script)
             is_valid = await self.check(key)
+        return is_valid == 0
+
+    def check_fallback(self, key: str) -> bool:
+        """Проверка Limit по политике на время недоступности Redis."""
+        if self.failure_policy == "open":
+            return True
+        if self.failure_policy == "closed":
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=RedisUnavailableException().msg,
+            )
+        return self.local_bucket.consume(key)
 
-        if is_valid == 0:
+    async def __call__(self, request: Request) -> Any:
+        """Метод вызова Depends для проверки IP адреса на лимит по запросам."""
+        key = self.req_key_builder(request)
+        started = perf_counter()
+        backend = "redis"
+        try:
+            if monotonic() < self._redis_down_until:
+                backend = "fallback"
+                is_valid = self.check_fallback(key)
+            else:
+                try:
+                    is_valid = await asyncio.wait_for(
+                        self.check_redis(key), self.redis_timeout
+                    )
+                except (RedisError, OSError, TimeoutError) as e:
+                    logger.warning(
+                        f"Rate limiter falls back to {self.failure_policy}: {e!r}"
+                    )
+                    self._redis_down_until = monotonic() + self.cooldown
+                    backend = "fallback"
+                    is_valid = self.check_fallback(key)
+        finally:
+            # Отказ политики closed (503) тоже попадает в замер
+            RATE_LIMIT_TIMERS[backend].observe(perf_counter() - started)
+
+        if is_valid:
             return True
         raise HTTPException(status_code=self.exp_status, detail=self.exp_message)
@@ -0,0 +1,47 @@
+"""Модуль объединения одновременных вычислений по ключу (single-flight)."""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Пока вычисление по ключу выполняется, повторные вызовы с тем же ключом
+    не запускают его заново, а ждут результат первого.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Метод выполнения func не более одного раза на ключ в один момент времени.
+        Вычисление идёт отдельной задачей, поэтому отмена одного из ожидающих
+        не прерывает его для остальных.
+
+        Args:
+            key (Hashable): Ключ вычисления
+            func (Callable[[], Awaitable[T]]): Фабрика корутины вычисления
+
+        Returns:
+            T: Результат вычисления
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Метод удаления завершённого вычисления."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Ошибка уже передана ожидающим, здесь только помечаем её полученной
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from database.connection import get_async_db_session
 from database.query import get_user_by_email, authenticate_user
 from helpers.auth import create_access_token
+from helpers.hashers import get_password_hash_async
 from models.users import Users
 from redis_core.rate_limiter import RateLimiter
 from schemas.users import UserLogin, UserRegister
@@ -50,7 +51,8 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Пользователь уже существует",
         )
-    async_session.add(Users(email=user.email, password_hash=user.password))
+    password_hash = await get_password_hash_async(user.password)
+    async_session.add(Users(email=user.email, password_hash=password_hash))
     await async_session.commit()
     return {"message": "Пользователь успешно зарегитрирован"}
 
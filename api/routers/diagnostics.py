@@ -0,0 +1,76 @@
+"""Модуль описание роутов диагностики сервиса."""
+
+from fastapi import APIRouter, Depends
+
+from database.connection import engine
+from database.replicas import replica_router
+from helpers.auth import check_service_token
+from redis_core.cache_fill import order_cache
+
+router = APIRouter(
+    prefix="/diagnostics",
+    tags=["Diagnostics"],
+    dependencies=[Depends(check_service_token)],
+)
+
+
+@router.get(
+    "/cache/",
+    description="Статистика попаданий в ближний кэш процесса и в Redis",
+    responses={
+        200: {
+            "description": "Статистика кэша заказов текущего воркера",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "listener": "running",
+                        "near": {"hits": 90, "misses": 10, "hit_ratio": 0.9, "size": 8},
+                        "redis": {"hits": 9, "misses": 1, "hit_ratio": 0.9},
+                    }
+                }
+            },
+        },
+    },
+)
+async def cache_stats() -> dict:
+    return order_cache.stats()
+
+
+@router.get(
+    "/pool/",
+    description="Состояние пулов соединений БД и время ожидания соединения",
+    responses={
+        200: {
+            "description": "Пулы основного сервера и реплик текущего воркера",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "primary": {
+                            "size": 5,
+                            "checked_in": 3,
+                            "checked_out": 2,
+                            "overflow": 0,
+                            "max_overflow": 10,
+                            "checkouts": 1200,
+                            "timeouts": 0,
+                            "wait_ms": {
+                                "avg": 0.42,
+                                "max": 12.5,
+                                "histogram": {"le_1ms": 1150, "le_5ms": 1190},
+                            },
+                        },
+                        "replicas": {"replica-1:5432/orders": {"lag": 0.0}},
+                    }
+                }
+            },
+        },
+    },
+)
+async def pool_stats() -> dict:
+    return {
+        "primary": engine.pool.snapshot(),
+        "replicas": {
+            replica.name: {"lag": replica.lag, **replica.engine.pool.snapshot()}
+            for replica in replica_router.replicas
+        },
+    }
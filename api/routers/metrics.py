@@ -0,0 +1,24 @@
+"""Модуль описание роута метрик Prometheus."""
+
+from fastapi import APIRouter, Depends, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from helpers.auth import check_service_token
+
+router = APIRouter(
+    prefix="", tags=["Metrics"], dependencies=[Depends(check_service_token)]
+)
+
+
+@router.get(
+    "/metrics",
+    description="Метрики текущего воркера в текстовом формате Prometheus",
+    responses={
+        200: {
+            "description": "Метрики Prometheus",
+            "content": {"text/plain": {}},
+        },
+    },
+)
+async def metrics() -> Response:
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
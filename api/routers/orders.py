@@ -1,28 +1,213 @@
 """Модуль описание работы с заказами."""
 
-import json
-from typing import TYPE_CHECKING
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Annotated, Any, AsyncIterator, Sequence
+from uuid import UUID
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
+from pydantic import ValidationError
 
 from configs import settings
-from database.connection import get_async_db_session
-from database.query import get_order_by_id, get_orders
+from database.connection import async_session_maker, get_async_db_session
+from database.query import (
+    add_outbox_events,
+    apply_order_stats,
+    create_orders,
+    get_order_by_id,
+    get_order_stats,
+    get_orders,
+    status_changes,
+    stream_orders,
+    update_orders_status,
+)
+from database.replicas import (
+    get_read_db_session,
+    replica_router,
+)
 from helpers.auth import get_current_user
+from helpers.enums import OrderStatus
+from helpers.order_ids import new_order_key
+from helpers.pagination import decode_cursor, encode_cursor
+from helpers.tracing import current_trace_context
 from models.orders import Orders as SqlOrders
-from rabbit_core.client import rmq_client
-from redis_core.client import redis_client
-from schemas.orders import Order, OrderCreate, OrderUpdate
+from models.outbox import Outbox
+from rabbit_core.outbox_relay import outbox_relay
+from redis_core.cache_fill import CacheFillTimeout, order_cache
+from schemas.orders import (
+    Order,
+    OrderAdapter,
+    OrderBulkItem,
+    OrderCreate,
+    OrdersBulkResult,
+    OrdersListFilter,
+    OrdersPage,
+    OrdersStatusUpdate,
+    OrdersStatusUpdateResult,
+    OrderStatusSummary,
+    OrdersSummary,
+    OrderUpdate,
+    Orders,
+)
 
 if TYPE_CHECKING:
+    from sqlalchemy import Row
     from sqlalchemy.ext.asyncio import AsyncSession
-    from models.users import Users
+    from schemas.users import CurrentUser
 
 
 security = HTTPBearer()
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+Limit = Annotated[
+    int,
+    Query(ge=1, le=settings.ORDERS_PAGE_MAX_LIMIT, description="Размер страницы"),
+]
+Cursor = Annotated[
+    str | None, Query(description="Курсор из next_cursor предыдущей страницы")
+]
+Stream = Annotated[
+    bool,
+    Query(
+        description=(
+            "Потоковая выдача всех заказов после курсора в формате NDJSON, "
+            "limit не учитывается"
+        )
+    ),
+]
+
+
+def orders_list_filter(
+    order_status: Annotated[
+        OrderStatus | None, Query(alias="status", description="Только заказы в статусе")
+    ] = None,
+    created_from: Annotated[
+        datetime | None, Query(description="Созданы не раньше")
+    ] = None,
+    created_to: Annotated[datetime | None, Query(description="Созданы раньше")] = None,
+    min_total_price: Annotated[
+        Decimal | None, Query(ge=0, description="Цена не меньше")
+    ] = None,
+    max_total_price: Annotated[
+        Decimal | None, Query(ge=0, description="Цена не больше")
+    ] = None,
+) -> OrdersListFilter:
+    """
+    Функция сборки фильтра списков заказов из query-параметров.
+
+    Raises:
+        RequestValidationError: Если диапазоны заданы некорректно
+    """
+    try:
+        return OrdersListFilter(
+            status=order_status,
+            created_from=created_from,
+            created_to=created_to,
+            min_total_price=min_total_price,
+            max_total_price=max_total_price,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(
+            e.errors(include_url=False, include_context=False)
+        )
+
+
+Filters = Annotated[OrdersListFilter, Depends(orders_list_filter)]
+
+
+def order_cache_key(order_id: str) -> str:
+    """
+    Функция формирования ключа кэша заказа.
+    Ответ GET /orders/{order_id}/ не зависит от запрашивающего пользователя,
+    поэтому ключ общий, а заполнение и инвалидация выполняются один раз на заказ.
+    """
+    return f"order:{order_id}"
+
+
+def new_order_event(order_id: str) -> dict:
+    """Функция формирования события outbox о новом заказе."""
+    return {
+        "exchange": settings.RMQ_EXCHANGE,
+        "routing_key": settings.RMQ_QUEUE,
+        "task_name": "new_order",
+        "payload": {"order_id": order_id},
+        "trace_context": current_trace_context(),
+    }
+
+
+def order_json(order: "SqlOrders | Row") -> bytes:
+    """
+    Функция сериализации заказа в итоговое тело ответа.
+    Эти же байты хранятся в кэше и отдаются при попадании без повторной
+    валидации и сериализации.
+    """
+    return OrderAdapter.dump_json(
+        OrderAdapter.validate_python(order, from_attributes=True)
+    )
+
+
+def orders_page_json(orders: Sequence["Row"], next_cursor: str | None) -> bytes:
+    """
+    Функция сериализации страницы заказов в тело ответа по схеме OrdersPage.
+    Все заказы валидируются и сериализуются одним проходом Orders,
+    без jsonable_encoder и повторной валидации response_model.
+    """
+    items = Orders.dump_json(Orders.validate_python(orders, from_attributes=True))
+    return b'{"items":' + items + b',"next_cursor":' + orjson.dumps(next_cursor) + b"}"
+
+
+async def list_orders(
+    async_session: "AsyncSession",
+    user_id: str | None,
+    limit: int,
+    cursor: str | None,
+    stream: bool,
+    filters: OrdersListFilter,
+) -> Response:
+    """
+    Функция формирования ответа для списков заказов.
+    Курсор хранит только позицию, фильтры передаются с каждой страницей.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        user_id (str | None): Идентификатор пользователя
+        limit (int): Размер страницы
+        cursor (str | None): Курсор от клиента
+        stream (bool): Флаг потоковой выдачи NDJSON
+        filters (OrdersListFilter): Условия отбора
+
+    Returns:
+        Response: Страница заказов (OrdersPage) либо поток NDJSON
+    """
+    after = decode_cursor(cursor) if cursor else None
+    if stream:
+
+        async def ndjson() -> AsyncIterator[bytes]:
+            async for order in stream_orders(
+                async_session,
+                user_id,
+                after,
+                settings.ORDERS_STREAM_CHUNK_SIZE,
+                filters,
+            ):
+                yield order_json(order) + b"\n"
+
+        return StreamingResponse(ndjson(), media_type=NDJSON_MEDIA_TYPE)
+
+    orders, next_key = await get_orders(
+        async_session, user_id, limit, after, filters
+    )
+    next_cursor = encode_cursor(*next_key) if next_key else None
+    return Response(
+        content=orders_page_json(orders, next_cursor), media_type="application/json"
+    )
+
 
 @router.post(
     "/",
@@ -44,33 +229,113 @@ async def create_order(
     order: OrderCreate,
     _auth=Depends(security),
     async_session: "AsyncSession" = Depends(get_async_db_session),
-    current_user: "Users" = Depends(get_current_user),
+    current_user: "CurrentUser" = Depends(get_current_user),
 ) -> Order:
+    order_id, created_at = new_order_key()
     new_order = SqlOrders(
+        id=order_id,
+        created_at=created_at,
         users_id=current_user.id,
         **order.model_dump(),
     )
     async_session.add(new_order)
-    await async_session.commit()
     await async_session.flush([new_order])
-
-    await rmq_client.send_message(
-        exchange_name=settings.RMQ_EXCHANGE,
-        queue_name=settings.RMQ_QUEUE,
-        message=json.dumps({"order_id": str(new_order.id)}),
-        task_name="new_order",
+    await apply_order_stats(
+        async_session, [(current_user.id, new_order.status, 1, new_order.total_price)]
     )
 
+    # Событие пишется в той же транзакции, что и заказ; отправку в RMQ
+    # выполняет outbox_relay в фоне.
+    async_session.add(Outbox(**new_order_event(str(new_order.id))))
+    await async_session.commit()
+    outbox_relay.notify()
+    await replica_router.mark_write(current_user.id)
+
     return new_order
 
 
+@router.post(
+    "/bulk/",
+    description=(
+        "Создание пачки заказов одним запросом в БД. "
+        "Каждый элемент валидируется отдельно как тело POST /orders/, "
+        "невалидные элементы возвращаются с ошибками и не мешают остальным"
+    ),
+    responses={
+        200: {
+            "description": "Результаты по каждому элементу в порядке запроса",
+            "model": OrdersBulkResult,
+        },
+        401: {
+            "description": "Ошибки авторизации",
+            "content": {
+                "application/json": {"example": {"detail": "Токен не валиден"}}
+            },
+        },
+    },
+)
+async def create_orders_bulk(
+    orders: Annotated[
+        list[dict[str, Any]],
+        Body(
+            min_length=1,
+            max_length=settings.ORDERS_BULK_MAX_SIZE,
+            examples=[
+                [{"items": ["book"], "total_price": 1000.00, "status": "PENDING"}]
+            ],
+        ),
+    ],
+    _auth=Depends(security),
+    async_session: "AsyncSession" = Depends(get_async_db_session),
+    current_user: "CurrentUser" = Depends(get_current_user),
+) -> OrdersBulkResult:
+    items: list[OrderBulkItem] = []
+    valid: list[tuple[int, OrderCreate]] = []
+    for index, raw in enumerate(orders):
+        try:
+            valid.append((index, OrderCreate.model_validate(raw)))
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            items.append(OrderBulkItem(index=index, errors=errors))
+
+    if valid:
+        created = await create_orders(
+            async_session,
+            current_user.id,
+            [order.model_dump() for _, order in valid],
+        )
+        await add_outbox_events(
+            async_session, [new_order_event(str(order.id)) for order in created]
+        )
+        await async_session.commit()
+        outbox_relay.notify()
+        await replica_router.mark_write(current_user.id)
+        items.extend(
+            OrderBulkItem(index=index, order=order)
+            for (index, _), order in zip(valid, created)
+        )
+
+    items.sort(key=lambda item: item.index)
+    return OrdersBulkResult(
+        created=len(valid), failed=len(orders) - len(valid), items=items
+    )
+
+
 @router.get(
     "/",
-    description="Получить все заказы",
+    description="Получить заказы постранично (keyset-пагинация по дате создания)",
+    response_model=OrdersPage,
     responses={
         200: {
             "description": "Заказы",
-            "model": list[Order],
+            "model": OrdersPage,
+            "content": {NDJSON_MEDIA_TYPE: {"example": '{"id": "...", ...}\n'}},
+        },
+        400: {
+            "description": "Некорректный курсор",
+            "content": {
+                "application/json": {"example": {"detail": "Некорректный курсор"}}
+            },
         },
         401: {
             "description": "Ошибки авторизации",
@@ -81,11 +346,15 @@ async def create_order(
     },
 )
 async def get_all_orders(
+    filters: Filters,
+    limit: Limit = settings.ORDERS_PAGE_LIMIT,
+    cursor: Cursor = None,
+    stream: Stream = False,
     _auth=Depends(security),
-    async_session: "AsyncSession" = Depends(get_async_db_session),
-    _: "Users" = Depends(get_current_user),
-) -> list[Order]:
-    return await get_orders(async_session)
+    async_session: "AsyncSession" = Depends(get_read_db_session),
+    _: "CurrentUser" = Depends(get_current_user),
+) -> Response:
+    return await list_orders(async_session, None, limit, cursor, stream, filters)
 
 
 @router.get(
@@ -106,26 +375,98 @@ async def get_all_orders(
             "description": "Отсутствие заказа",
             "content": {"application/json": {"example": {"detail": "Заказ не найден"}}},
         },
+        503: {
+            "description": "Заказ загружает другой запрос и не успел",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Заказ загружается, повторите запрос"}
+                }
+            },
+        },
     },
 )
 async def get_order(
     order_id: str,
     _auth=Depends(security),
-    async_session: "AsyncSession" = Depends(get_async_db_session),
-    user: "Users" = Depends(get_current_user),
+    _: "CurrentUser" = Depends(get_current_user),
 ) -> Order:
-    unique_key: str = f"{order_id}-{user.id}"
-    _, data = await redis_client.check_cache(unique_key)
-    if data:
-        order = Order.model_validate_json(data)
-    else:
-        order = await get_order_by_id(order_id, async_session)
-        if order is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Заказ не найден"
-            )
-        await redis_client.add_to_cache(unique_key, Order.model_validate(order).model_dump(), settings.REDIS_TTL_EXPIRE)
-    return order
+
+    async def load() -> bytes | None:
+        # Загрузка может быть общей для нескольких запросов, поэтому
+        # в собственной сессии, а не в сессии текущего запроса. Значение
+        # попадает в общий кэш, поэтому читается с основного сервера:
+        # отстающая реплика вернула бы в кэш статус до PATCH.
+        async with async_session_maker() as async_session:
+            order = await get_order_by_id(order_id, async_session)
+            return None if order is None else order_json(order)
+
+    try:
+        data = await order_cache.get(
+            order_cache_key(order_id), load, settings.REDIS_TTL_EXPIRE
+        )
+    except CacheFillTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Заказ загружается, повторите запрос",
+        )
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Заказ не найден"
+        )
+    return Response(content=data, media_type="application/json")
+
+
+@router.patch(
+    "/status/",
+    description=(
+        "Поменять статус множества заказов текущего пользователя по списку ids "
+        "и/или фильтру одним запросом в БД"
+    ),
+    responses={
+        200: {"description": "Изменённые заказы", "model": OrdersStatusUpdateResult},
+        400: {
+            "description": "Под условия попадает слишком много заказов",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Под условия попадает больше 10000 заказов"}
+                }
+            },
+        },
+        401: {
+            "description": "Ошибки авторизации",
+            "content": {
+                "application/json": {"example": {"detail": "Токен не валиден"}}
+            },
+        },
+    },
+)
+async def update_orders_status_bulk(
+    updated_data: OrdersStatusUpdate,
+    _auth=Depends(security),
+    async_session: "AsyncSession" = Depends(get_async_db_session),
+    current_user: "CurrentUser" = Depends(get_current_user),
+) -> OrdersStatusUpdateResult:
+    max_size = settings.ORDERS_STATUS_BULK_MAX_SIZE
+    ids = await update_orders_status(
+        async_session,
+        updated_data.status,
+        current_user.id,
+        ids=updated_data.ids,
+        filters=updated_data.filters,
+        limit=max_size + 1,
+    )
+    if len(ids) > max_size:
+        # Изменения и агрегаты откатываются целиком, а не частично
+        await async_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Под условия попадает больше {max_size} заказов",
+        )
+    await async_session.commit()
+    await replica_router.mark_write(current_user.id)
+
+    await order_cache.evict(*(order_cache_key(str(id_)) for id_ in ids))
+    return OrdersStatusUpdateResult(updated=len(ids), ids=ids)
 
 
 @router.patch(
@@ -150,33 +491,46 @@ async def update_order_status(
     updated_data: OrderUpdate,
     _auth=Depends(security),
     async_session: "AsyncSession" = Depends(get_async_db_session),
-    user: "Users" = Depends(get_current_user),
+    current_user: "CurrentUser" = Depends(get_current_user),
 ) -> Order:
-    order = await get_order_by_id(order_id, async_session)
+    # Строка блокируется, чтобы прежний статус для агрегатов не устарел
+    order = await get_order_by_id(order_id, async_session, for_update=True)
     if order is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Заказ не найден"
         )
+    await apply_order_stats(
+        async_session,
+        status_changes(
+            order.users_id, order.total_price, order.status, updated_data.status
+        ),
+    )
     order.status = updated_data.status
     await async_session.commit()
+    await replica_router.mark_write(current_user.id)
     await async_session.refresh(order)
 
-    unique_key = f"{order_id}-{user.id}"
-    check_cache = await redis_client.check_cache(unique_key)
-    if check_cache:
-        order_as_pydantic = Order.model_validate(order)
-        await redis_client.add_to_cache(unique_key, order_as_pydantic.model_dump(), settings.REDIS_TTL_EXPIRE)
+    data = order_json(order)
+    await order_cache.set(order_cache_key(order_id), data, settings.REDIS_TTL_EXPIRE)
 
-    return order
+    return Response(content=data, media_type="application/json")
 
 
 @router.get(
     "/user/{user_id}/",
-    description="Получить заказы конкретного пользователя",
+    description="Получить заказы конкретного пользователя постранично",
+    response_model=OrdersPage,
     responses={
         200: {
             "description": "Заказы пользователя",
-            "model": list[Order],
+            "model": OrdersPage,
+            "content": {NDJSON_MEDIA_TYPE: {"example": '{"id": "...", ...}\n'}},
+        },
+        400: {
+            "description": "Некорректный курсор",
+            "content": {
+                "application/json": {"example": {"detail": "Некорректный курсор"}}
+            },
         },
         401: {
             "description": "Ошибки авторизации",
@@ -188,8 +542,52 @@ async def update_order_status(
 )
 async def get_users_orders(
     user_id: str,
+    filters: Filters,
+    limit: Limit = settings.ORDERS_PAGE_LIMIT,
+    cursor: Cursor = None,
+    stream: Stream = False,
     _auth=Depends(security),
-    async_session: "AsyncSession" = Depends(get_async_db_session),
-    _: "Users" = Depends(get_current_user),
-) -> list[Order]:
-    return await get_orders(async_session, user_id)
+    async_session: "AsyncSession" = Depends(get_read_db_session),
+    _: "CurrentUser" = Depends(get_current_user),
+) -> Response:
+    return await list_orders(async_session, user_id, limit, cursor, stream, filters)
+
+
+@router.get(
+    "/user/{user_id}/summary/",
+    description=(
+        "Получить количество и сумму заказов пользователя по статусам. "
+        "Агрегаты ведутся при изменении заказов, время ответа не зависит "
+        "от количества заказов"
+    ),
+    responses={
+        200: {"description": "Сводка по заказам пользователя", "model": OrdersSummary},
+        401: {
+            "description": "Ошибки авторизации",
+            "content": {
+                "application/json": {"example": {"detail": "Токен не валиден"}}
+            },
+        },
+    },
+)
+async def get_users_orders_summary(
+    user_id: UUID,
+    _auth=Depends(security),
+    async_session: "AsyncSession" = Depends(get_read_db_session),
+    _: "CurrentUser" = Depends(get_current_user),
+) -> OrdersSummary:
+    stats = {row.status: row for row in await get_order_stats(async_session, user_id)}
+    by_status = [
+        OrderStatusSummary.model_validate(stats[order_status])
+        if order_status in stats
+        else OrderStatusSummary(
+            status=order_status, orders_count=0, total_price=Decimal(0)
+        )
+        for order_status in OrderStatus
+    ]
+    return OrdersSummary(
+        users_id=user_id,
+        orders_count=sum(item.orders_count for item in by_status),
+        total_price=sum((item.total_price for item in by_status), Decimal(0)),
+        by_status=by_status,
+    )
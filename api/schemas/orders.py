@@ -4,8 +4,9 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Annotated, Any
 from uuid import UUID
-from pydantic import BaseModel, Field, TypeAdapter
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 
+from configs import settings
 from helpers.enums import OrderStatus
 
 
@@ -35,4 +36,126 @@ class OrderUpdate(BaseModel):
     status: Annotated[OrderStatus, Field(description="Изменение статуса.")]
 
 
+class OrdersPage(BaseModel):
+    items: Annotated[list[Order], Field(description="Заказы текущей страницы")]
+    next_cursor: Annotated[
+        str | None,
+        Field(description="Курсор следующей страницы, null если страница последняя"),
+    ]
+
+
+class OrderBulkItem(BaseModel):
+    index: Annotated[int, Field(description="Позиция заказа в запросе")]
+    order: Annotated[Order | None, Field(description="Созданный заказ")] = None
+    errors: Annotated[
+        list[dict[str, Any]] | None, Field(description="Ошибки валидации заказа")
+    ] = None
+
+
+class OrdersBulkResult(BaseModel):
+    created: Annotated[int, Field(description="Количество созданных заказов")]
+    failed: Annotated[int, Field(description="Количество отклонённых заказов")]
+    items: Annotated[
+        list[OrderBulkItem], Field(description="Результаты в порядке запроса")
+    ]
+
+
+class OrdersListFilter(BaseModel):
+    status: Annotated[
+        OrderStatus | None, Field(description="Только заказы в статусе")
+    ] = None
+    created_from: Annotated[
+        datetime | None, Field(description="Созданы не раньше")
+    ] = None
+    created_to: Annotated[datetime | None, Field(description="Созданы раньше")] = None
+    min_total_price: Annotated[
+        Decimal | None, Field(ge=0, description="Цена не меньше")
+    ] = None
+    max_total_price: Annotated[
+        Decimal | None, Field(ge=0, description="Цена не больше")
+    ] = None
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        if (
+            self.created_from is not None
+            and self.created_to is not None
+            and self.created_from >= self.created_to
+        ):
+            raise ValueError("created_from должен быть раньше created_to")
+        if (
+            self.min_total_price is not None
+            and self.max_total_price is not None
+            and self.min_total_price > self.max_total_price
+        ):
+            raise ValueError("min_total_price не может быть больше max_total_price")
+        return self
+
+
+class OrdersFilter(BaseModel):
+    status: Annotated[
+        OrderStatus | None, Field(description="Текущий статус заказов")
+    ] = None
+    created_from: Annotated[
+        datetime | None, Field(description="Созданы не раньше")
+    ] = None
+    created_to: Annotated[datetime | None, Field(description="Созданы раньше")] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("Фильтр должен содержать хотя бы одно условие")
+        return self
+
+
+class OrdersStatusUpdate(BaseModel):
+    ids: Annotated[
+        list[UUID] | None,
+        Field(
+            description="Идентификаторы заказов",
+            min_length=1,
+            max_length=settings.ORDERS_STATUS_BULK_MAX_SIZE,
+        ),
+    ] = None
+    filters: Annotated[
+        OrdersFilter | None,
+        Field(description="Условия отбора заказов, объединяются с ids через AND"),
+    ] = None
+    status: Annotated[OrderStatus, Field(description="Новый статус")]
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if self.ids is None and self.filters is None:
+            raise ValueError("Нужно передать ids или filters")
+        return self
+
+
+class OrdersStatusUpdateResult(BaseModel):
+    updated: Annotated[int, Field(description="Количество изменённых заказов")]
+    ids: Annotated[list[UUID], Field(description="Идентификаторы изменённых заказов")]
+
+
+class OrderStatusSummary(BaseModel):
+    status: Annotated[OrderStatus, Field(description="Статус заказов")]
+    orders_count: Annotated[int, Field(description="Количество заказов")]
+    total_price: Annotated[
+        Decimal, Field(description="Сумма заказов", decimal_places=2)
+    ]
+
+    class Config:
+        from_attributes = True
+
+
+class OrdersSummary(BaseModel):
+    users_id: Annotated[UUID, Field(description="Владелец заказов")]
+    orders_count: Annotated[int, Field(description="Всего заказов")]
+    total_price: Annotated[
+        Decimal, Field(description="Сумма всех заказов", decimal_places=2)
+    ]
+    by_status: Annotated[
+        list[OrderStatusSummary], Field(description="Разбивка по всем статусам")
+    ]
+
+
+OrderAdapter = TypeAdapter(Order)
 Orders = TypeAdapter(list[Order])
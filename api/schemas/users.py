@@ -1,18 +1,24 @@
 """Модуль описание модели валидации работы с пользователями."""
 
 from typing import Annotated
-from pydantic import AfterValidator, BaseModel, EmailStr, Field
-
-from helpers.hashers import get_password_hash
+from uuid import UUID
+from pydantic import BaseModel, EmailStr, Field
 
 
 class UserRegister(BaseModel):
     email: Annotated[EmailStr, Field(description="Электронная почта пользователя")]
-    password: Annotated[
-        str, Field(description="Пароль"), AfterValidator(get_password_hash)
-    ]
+    password: Annotated[str, Field(description="Пароль")]
 
 
 class UserLogin(BaseModel):
     email: Annotated[EmailStr, Field(description="Электронная почта пользователя")]
     password: Annotated[str, Field(description="Пароль")]
+
+
+class CurrentUser(BaseModel):
+    id: Annotated[UUID, Field(description="Идентификатор пользователя")]
+    email: Annotated[str, Field(description="Электронная почта пользователя")]
+
+    class Config:
+        from_attributes = True
+        frozen = True
@@ -0,0 +1,138 @@
+"""
+Бенчмарк сквозной обработки событий new_order в режимах taskiq и inline.
+
+Поднимает в одном процессе консюмер FastStream и воркер TaskIQ, публикует
+count событий по заказам в статусе PENDING и ждёт записи их статусов.
+Задержка считается от публикации события до коммита статуса заказа.
+Количество сообщений брокера - опубликованные события плюс сообщения,
+отправленные в TaskIQ. Требуются RabbitMQ и Postgres со схемой сервиса api.
+
+Запуск: python -m benchmarks.event_hop --count 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import time
+
+from taskiq import TaskiqMessage, TaskiqMiddleware
+from taskiq.api import run_receiver_task
+
+from benchmarks.processing import cleanup, seed
+from benchmarks.report import emit, percentiles
+from configs import settings
+from database.connection import engine
+from faststream_core.broker import broker
+from taskiq_core.broker import broker as taskiq_broker
+from taskiq_core.processing import order_processor
+
+
+class SentCounter(TaskiqMiddleware):
+    """Счётчик сообщений, отправленных в брокер TaskIQ."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = 0
+
+    def post_send(self, message: TaskiqMessage) -> None:
+        self.sent += 1
+
+
+def track_completion(done: dict[str, float]) -> None:
+    """Фиксация времени записи статуса каждого заказа.
+
+    Оба режима заканчиваются вызовом order_processor.process, который
+    возвращается после коммита статуса.
+    """
+    process = order_processor.process
+
+    async def tracked(order_ids: list[str]) -> dict[str, int]:
+        result = await process(order_ids)
+        finished = time.perf_counter()
+        for order_id in order_ids:
+            done[order_id] = finished
+        return result
+
+    order_processor.process = tracked
+
+
+async def run(
+    mode: str, count: int, concurrency: int, counter: SentCounter, timeout: float
+) -> dict:
+    """Прогон count событий в заданном режиме."""
+    settings.CONSUMER_EXECUTION_MODE = mode
+    user_id, ids = await seed(count)
+    done: dict[str, float] = {}
+    track_completion(done)
+    published: dict[str, float] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    sent_before = counter.sent
+
+    async def publish(order_id: str) -> None:
+        async with semaphore:
+            published[order_id] = time.perf_counter()
+            await broker.publish(
+                {"order_id": order_id},
+                queue=settings.RMQ_QUEUE,
+                exchange=settings.RMQ_EXCHANGE,
+                headers={"task_name": "new_order"},
+            )
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(publish(str(order_id)) for order_id in ids))
+        deadline = started + timeout
+        while len(done) < count and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+    finally:
+        del order_processor.process
+        await cleanup(user_id)
+
+    events = len(published)
+    return {
+        "seconds": round(elapsed, 4),
+        "processed": len(done),
+        "events_per_sec": round(len(done) / elapsed, 1),
+        "latency_ms": percentiles(
+            [done[order_id] - published[order_id] for order_id in done]
+        ),
+        "broker_messages": events + counter.sent - sent_before,
+        "broker_messages_per_event": round(
+            (events + counter.sent - sent_before) / events, 3
+        ),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    modes = ["taskiq", "inline"] if args.mode == "both" else [args.mode]
+    counter = SentCounter()
+    taskiq_broker.add_middlewares(counter)
+
+    await taskiq_broker.startup()
+    worker = asyncio.create_task(
+        run_receiver_task(taskiq_broker, max_async_tasks=settings.TASKIQ_PREFETCH_COUNT)
+    )
+    await broker.start()
+    results = {}
+    try:
+        for mode in modes:
+            results[mode] = await run(
+                mode, args.count, args.concurrency, counter, args.timeout
+            )
+    finally:
+        await broker.stop()
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        await order_processor.close()
+        await taskiq_broker.shutdown()
+        await engine.dispose()
+    emit("event_hop", vars(args), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--mode", choices=["taskiq", "inline", "both"], default="both")
+    asyncio.run(main(parser.parse_args()))
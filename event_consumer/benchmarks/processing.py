@@ -0,0 +1,151 @@
+"""
+Бенчмарк обработки заказов воркером.
+
+Создаёт count заказов в статусе PENDING у служебного пользователя и прогоняет
+их через OrderProcessor по одному заказу на сообщение, как это делает
+process_order. Сравнивает запись статуса отдельным UPDATE на каждый заказ
+(flush-size 1) с накоплением и пакетной записью. Задержка считается от выдачи
+сообщения до коммита его статуса. Требуется Postgres со схемой сервиса api.
+
+Запуск: python -m benchmarks.processing --count 5000 --prefetch 100
+"""
+
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, func, insert, select, text
+
+from benchmarks.report import emit, percentiles
+from configs import settings
+from database.connection import async_session_maker, engine
+from database.tables import orders, user_order_stats
+from helpers.enums import OrderStatus
+from taskiq_core.processing import OrderProcessor
+
+BENCH_EMAIL = "bench-processing@example.com"
+
+
+async def seed(count: int) -> tuple[UUID, list[UUID]]:
+    """Создание служебного пользователя и count заказов в статусе PENDING.
+
+    Каждый десятый заказ без товаров, он должен быть отменён.
+    """
+    async with async_session_maker() as session:
+        user_id = await session.scalar(
+            text(
+                "INSERT INTO users (email, password_hash) VALUES (:email, '-') "
+                "ON CONFLICT (email) DO UPDATE SET email = EXCLUDED.email "
+                "RETURNING id"
+            ),
+            {"email": BENCH_EMAIL},
+        )
+        ids = [uuid4() for _ in range(count)]
+        await session.execute(
+            insert(orders),
+            [
+                {
+                    "id": order_id,
+                    "users_id": user_id,
+                    "items": [] if n % 10 == 0 else [{"sku": n}],
+                    "total_price": Decimal("100.00"),
+                    "status": OrderStatus.PENDING,
+                }
+                for n, order_id in enumerate(ids)
+            ],
+        )
+        await session.commit()
+    return user_id, ids
+
+
+async def cleanup(user_id: UUID) -> None:
+    """Удаление данных бенчмарка."""
+    async with async_session_maker() as session:
+        await session.execute(delete(orders).where(orders.c.users_id == user_id))
+        await session.execute(
+            delete(user_order_stats).where(user_order_stats.c.users_id == user_id)
+        )
+        await session.execute(
+            text("DELETE FROM users WHERE id = :id"), {"id": user_id}
+        )
+        await session.commit()
+
+
+async def run(processor: OrderProcessor, ids: list[UUID], prefetch: int) -> dict:
+    """Прогон заказов с ограничением неподтверждённых сообщений (prefetch)."""
+    semaphore = asyncio.Semaphore(prefetch)
+    latencies: list[float] = []
+
+    async def one(order_id: UUID) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await processor.process([str(order_id)])
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(order_id) for order_id in ids))
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": round(elapsed, 4),
+        "orders_per_sec": round(len(ids) / elapsed, 1),
+        "latency_ms": percentiles(latencies),
+    }
+
+
+async def left_pending(user_id: UUID) -> int:
+    """Количество заказов бенчмарка, оставшихся в PENDING."""
+    async with async_session_maker() as session:
+        return await session.scalar(
+            select(func.count()).where(
+                orders.c.users_id == user_id,
+                orders.c.status == OrderStatus.PENDING,
+            )
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    modes = {"per_order": 1, "batched": args.flush_size}
+    if args.mode != "both":
+        modes = {args.mode: modes[args.mode]}
+
+    results = {}
+    try:
+        for mode, flush_size in modes.items():
+            processor = OrderProcessor(
+                async_session_maker,
+                concurrency=args.processing_concurrency,
+                payment_latency_ms=args.payment_latency_ms,
+                flush_size=flush_size,
+                flush_interval_ms=args.flush_interval_ms,
+            )
+            user_id, ids = await seed(args.count)
+            try:
+                results[mode] = await run(processor, ids, args.prefetch)
+                results[mode]["left_pending"] = await left_pending(user_id)
+            finally:
+                await cleanup(user_id)
+    finally:
+        await engine.dispose()
+    emit("order_processing", vars(args), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--prefetch", type=int, default=settings.TASKIQ_PREFETCH_COUNT)
+    parser.add_argument(
+        "--processing-concurrency", type=int, default=settings.PROCESSING_CONCURRENCY
+    )
+    parser.add_argument(
+        "--payment-latency-ms", type=int, default=settings.PAYMENT_LATENCY_MS
+    )
+    parser.add_argument("--flush-size", type=int, default=settings.STATUS_FLUSH_SIZE)
+    parser.add_argument(
+        "--flush-interval-ms", type=int, default=settings.STATUS_FLUSH_INTERVAL_MS
+    )
+    parser.add_argument(
+        "--mode", choices=["per_order", "batched", "both"], default="both"
+    )
+    asyncio.run(main(parser.parse_args()))
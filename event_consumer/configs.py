@@ -9,6 +9,15 @@ class Configs(BaseSettings):
         Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], Field("INFO")
     ]
 
+    # Настройки подключения к основной базе данных.
+    POSTGRES_HOST: Annotated[str, Field("postgres")]
+    POSTGRES_PORT: Annotated[int, Field(5432)]
+    POSTGRES_DB: Annotated[str, Field("orders_user")]
+    POSTGRES_PASSWORD: Annotated[str, Field("LyhaEkM2D6TeH96W8jxG")]
+    POSTGRES_USER: Annotated[str, Field("orders_user")]
+    POSTGRES_TRANSACTION_TIMEOUT: Annotated[int, Field(30)]
+    POSTGRES_ECHO: Annotated[bool, Field(False)]
+
     # Настройки rabbitmq
     RMQ_USER: Annotated[str, Field("user")]
     RMQ_PASSWORD: Annotated[str, Field("bitnami")]
@@ -20,6 +29,28 @@ class Configs(BaseSettings):
     RMQ_EXCHANGE: Annotated[str, Field("test")]
     RMQ_QUEUE: Annotated[str, Field("test")]
 
+    # Настройки потребления событий
+    CONSUMER_PREFETCH_COUNT: Annotated[int, Field(100)]
+    CONSUMER_BATCH_ENABLED: Annotated[bool, Field(False)]
+    CONSUMER_BATCH_SIZE: Annotated[int, Field(50)]
+    CONSUMER_BATCH_MAX_WAIT_MS: Annotated[int, Field(50)]
+    CONSUMER_EXECUTION_MODE: Annotated[Literal["taskiq", "inline"], Field("taskiq")]
+    CONSUMER_INLINE_CONCURRENCY: Annotated[int, Field(100)]
+
+    # Настройки обработки заказов воркером TaskIQ
+    TASKIQ_PREFETCH_COUNT: Annotated[int, Field(100)]
+    PROCESSING_CONCURRENCY: Annotated[int, Field(50)]
+    PAYMENT_LATENCY_MS: Annotated[int, Field(20)]
+    STATUS_FLUSH_SIZE: Annotated[int, Field(200)]
+    STATUS_FLUSH_INTERVAL_MS: Annotated[int, Field(50)]
+
+    # Настройки трассировки OpenTelemetry
+    TRACING_ENABLED: Annotated[bool, Field(False)]
+    TRACING_EXPORTER: Annotated[Literal["otlp", "console", "memory"], Field("otlp")]
+    TRACING_SERVICE_NAME: Annotated[str, Field("orders-consumer")]
+    TRACING_SAMPLE_RATIO: Annotated[float, Field(1.0)]
+    TRACING_OTLP_ENDPOINT: Annotated[str, Field("http://localhost:4318/v1/traces")]
+
     @computed_field
     @property
     def RMQ_URL(self) -> str:
@@ -34,5 +65,19 @@ class Configs(BaseSettings):
         )
         return url
 
+    @computed_field
+    @property
+    def POSTGRES_URL(self) -> str:
+        """Метод формирования url для базы данных.
+
+        Returns:
+            str: URL для подключения к Postgres.
+        """
+        url = (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:"
+            f"{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+        return url
+
 
 settings = Configs()
@@ -0,0 +1,18 @@
+"""Модуль описание подключения к БД."""
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from configs import settings
+
+engine = create_async_engine(
+    settings.POSTGRES_URL,
+    echo=settings.POSTGRES_ECHO,
+    connect_args={
+        "server_settings": {
+            "statement_timeout": f"{settings.POSTGRES_TRANSACTION_TIMEOUT * 1000}"
+        }
+    },
+)
+async_session_maker = async_sessionmaker(
+    engine, expire_on_commit=False, class_=AsyncSession
+)
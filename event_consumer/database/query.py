@@ -0,0 +1,149 @@
+"""Модуль работы с БД."""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from sqlalchemy import (
+    TIMESTAMP,
+    ColumnElement,
+    Row,
+    Uuid,
+    any_,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from database.tables import orders, user_order_stats
+from helpers.enums import OrderStatus
+from helpers.order_ids import orders_created_at
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def orders_by_ids(ids: list[UUID]) -> list[ColumnElement[bool]]:
+    """
+    Функция условий отбора заказов по идентификаторам.
+    Для UUIDv7 добавляется условие по created_at из id, чтобы Postgres
+    читал только партиции этих заказов, а не ix_orders_id каждой партиции.
+
+    Args:
+        ids (list[UUID]): Идентификаторы заказов
+
+    Returns:
+        list[ColumnElement[bool]]: Условия для where
+    """
+    conditions = [orders.c.id == any_(literal(ids, ARRAY(Uuid)))]
+    created_at = orders_created_at(ids)
+    if created_at is not None:
+        conditions.append(
+            orders.c.created_at == any_(literal(created_at, ARRAY(TIMESTAMP(True))))
+        )
+    return conditions
+
+
+async def get_pending_orders(
+    async_session: "AsyncSession", ids: list[UUID]
+) -> list[Row]:
+    """
+    Функция получения пачки заказов, ожидающих обработки, одним запросом.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        ids (list[UUID]): Идентификаторы заказов
+
+    Returns:
+        list[Row]: Строки (id, items, total_price) заказов в статусе PENDING
+    """
+    stmt = select(orders.c.id, orders.c["items"], orders.c.total_price).where(
+        *orders_by_ids(ids), orders.c.status == OrderStatus.PENDING
+    )
+    return list(await async_session.execute(stmt))
+
+
+async def set_orders_status(
+    async_session: "AsyncSession", status: OrderStatus, ids: list[UUID]
+) -> list[UUID]:
+    """
+    Функция перевода пачки заказов из PENDING в итоговый статус одним UPDATE.
+    Условие на PENDING делает повторную обработку сообщения безопасной:
+    уже обработанные заказы не перезаписываются. Агрегаты пользователей
+    (user_order_stats) меняются в той же транзакции.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        status (OrderStatus): Итоговый статус
+        ids (list[UUID]): Идентификаторы заказов
+
+    Returns:
+        list[UUID]: Идентификаторы изменённых заказов
+    """
+    stmt = (
+        update(orders)
+        .where(*orders_by_ids(ids), orders.c.status == OrderStatus.PENDING)
+        .values(status=status)
+        .returning(orders.c.id, orders.c.users_id, orders.c.total_price)
+    )
+    rows = (await async_session.execute(stmt)).all()
+
+    deltas: dict[UUID, list] = defaultdict(lambda: [0, Decimal(0)])
+    for row in rows:
+        deltas[row.users_id][0] += 1
+        deltas[row.users_id][1] += row.total_price
+    await apply_order_stats(
+        async_session,
+        [
+            change
+            for users_id, (count, total_price) in deltas.items()
+            for change in (
+                (users_id, OrderStatus.PENDING, -count, -total_price),
+                (users_id, status, count, total_price),
+            )
+        ],
+    )
+    return [row.id for row in rows]
+
+
+async def apply_order_stats(
+    async_session: "AsyncSession",
+    changes: list[tuple[UUID, OrderStatus, int, Decimal]],
+) -> None:
+    """
+    Функция изменения агрегатов заказов пользователей дельтами одним
+    INSERT ... ON CONFLICT DO UPDATE. Повторяет одноимённую функцию сервиса
+    api: строки идут в порядке ключа, чтобы конкурентные транзакции
+    блокировали их в одной последовательности.
+
+    Args:
+        async_session (AsyncSession): Асинхронная сессия в БД.
+        changes (list[tuple[UUID, OrderStatus, int, Decimal]]): Дельты
+            (пользователь, статус, количество, сумма), уникальные по паре
+            (пользователь, статус)
+    """
+    if not changes:
+        return
+    rows = [
+        {
+            "users_id": users_id,
+            "status": status,
+            "orders_count": count,
+            "total_price": total_price,
+        }
+        for users_id, status, count, total_price in sorted(
+            changes, key=lambda change: (change[0], change[1].value)
+        )
+    ]
+    stmt = insert(user_order_stats).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[user_order_stats.c.users_id, user_order_stats.c.status],
+        set_={
+            "orders_count": user_order_stats.c.orders_count
+            + stmt.excluded.orders_count,
+            "total_price": user_order_stats.c.total_price + stmt.excluded.total_price,
+        },
+    )
+    await async_session.execute(stmt)
@@ -0,0 +1,42 @@
+"""Модуль описания таблиц, с которыми работает воркер.
+
+Схемой владеет сервис api (модели и миграции alembic), здесь описаны только
+нужные воркеру колонки в виде таблиц SQLAlchemy Core.
+"""
+
+from sqlalchemy import (
+    TIMESTAMP,
+    BigInteger,
+    Column,
+    Enum,
+    MetaData,
+    Numeric,
+    Table,
+    Uuid,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from helpers.enums import OrderStatus
+
+metadata = MetaData()
+
+orders = Table(
+    "orders",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("users_id", Uuid),
+    Column("items", JSONB),
+    Column("total_price", Numeric(precision=12, scale=2)),
+    Column("status", Enum(OrderStatus, name="orderstatus")),
+    # Таблица разбита на помесячные партиции, created_at входит в первичный ключ
+    Column("created_at", TIMESTAMP(timezone=True), primary_key=True),
+)
+
+user_order_stats = Table(
+    "user_order_stats",
+    metadata,
+    Column("users_id", Uuid, primary_key=True),
+    Column("status", Enum(OrderStatus, name="orderstatus"), primary_key=True),
+    Column("orders_count", BigInteger),
+    Column("total_price", Numeric(precision=14, scale=2)),
+)
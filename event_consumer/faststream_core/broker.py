@@ -1,13 +1,66 @@
 """Модуль работы с брокером FastStream"""
 
-from faststream import Logger
-from faststream.rabbit import RabbitBroker, RabbitExchange, RabbitMessage, RabbitQueue
+import asyncio
+
+from faststream import AckPolicy, Logger
+from faststream.rabbit import (
+    Channel,
+    RabbitBroker,
+    RabbitExchange,
+    RabbitMessage,
+    RabbitQueue,
+)
+from faststream.rabbit.opentelemetry import RabbitTelemetryMiddleware
+from opentelemetry import context as context_api
+from opentelemetry import trace
+from opentelemetry.trace import Link, SpanContext
 
 from configs import settings
 
-from taskiq_core.tasks import process_order
+from helpers.batcher import MessageBatcher
+from helpers.tracing import tracer
+from taskiq_core.processing import order_processor
+from taskiq_core.tasks import process_order, process_orders
+
+broker = RabbitBroker(
+    url=settings.RMQ_URL,
+    # Span обработки сообщения продолжает trace API из заголовка traceparent
+    middlewares=[RabbitTelemetryMiddleware()] if settings.TRACING_ENABLED else [],
+)
+
+# Ограничение одновременно выполняемых в консюмере обработок (режим inline)
+inline_semaphore = asyncio.Semaphore(settings.CONSUMER_INLINE_CONCURRENCY)
+
+
+async def process_inline(order_ids: list[str]) -> None:
+    """Обработка заказов в процессе консюмера, без передачи в taskiq."""
+    async with inline_semaphore:
+        await order_processor.process(order_ids)
+
 
-broker = RabbitBroker(url=settings.RMQ_URL)
+async def send_batch(items: list[tuple[str, SpanContext]]) -> None:
+    """Отправка пачки заказов в taskiq одним сообщением или обработка на месте.
+    У пачки свой trace со ссылками на span каждого сообщения в ней."""
+    order_ids = [order_id for order_id, _ in items]
+    with tracer.start_as_current_span(
+        "orders batch",
+        context=context_api.Context(),
+        links=[
+            Link(span_context) for _, span_context in items if span_context.is_valid
+        ],
+        attributes={"messaging.batch.message_count": len(items)},
+    ):
+        if settings.CONSUMER_EXECUTION_MODE == "inline":
+            await process_inline(order_ids)
+            return
+        await process_orders.kiq(order_ids)
+
+
+order_batcher = MessageBatcher(
+    send_batch,
+    batch_size=settings.CONSUMER_BATCH_SIZE,
+    max_wait_ms=settings.CONSUMER_BATCH_MAX_WAIT_MS,
+)
 
 
 @broker.subscriber(
@@ -16,9 +69,24 @@ broker = RabbitBroker(url=settings.RMQ_URL)
         durable=True,
     ),
     exchange=RabbitExchange(name=settings.RMQ_EXCHANGE, durable=True),
+    # prefetch ограничивает количество неподтверждённых сообщений; в пакетном
+    # режиме он должен быть не меньше CONSUMER_BATCH_SIZE, иначе пачка
+    # не наберётся и будет отправляться по таймауту
+    channel=Channel(prefetch_count=settings.CONSUMER_PREFETCH_COUNT),
+    # Ошибка в пакетном режиме - это ошибка отправки пачки, в режиме inline -
+    # ошибка записи в БД; обработка идемпотентна, сообщение возвращается в очередь
+    ack_policy=(
+        AckPolicy.NACK_ON_ERROR
+        if settings.CONSUMER_BATCH_ENABLED
+        or settings.CONSUMER_EXECUTION_MODE == "inline"
+        else AckPolicy.REJECT_ON_ERROR
+    ),
 )
 async def handle_task(message: RabbitMessage, logger: Logger):
     """Саб для обработки сообщения по конфигам выше.
+    В пакетном режиме сообщения копятся в order_batcher и подтверждаются
+    вместе после отправки пачки в taskiq. В режиме inline заказ обрабатывается
+    прямо в консюмере, сообщение подтверждается после записи статуса.
 
     Args:
         message (RabbitMessage): Приходящее сообщение как сущность FastStream.
@@ -35,5 +103,17 @@ async def handle_task(message: RabbitMessage, logger: Logger):
         logger.warning("No order ID was given")
         return
 
+    if settings.CONSUMER_BATCH_ENABLED:
+        await order_batcher.submit(
+            (order_id, trace.get_current_span().get_span_context())
+        )
+        logger.info("Message sent to taskiq in batch")
+        return
+
+    if settings.CONSUMER_EXECUTION_MODE == "inline":
+        await process_inline([order_id])
+        logger.info("Order processed inline")
+        return
+
     await process_order.kiq(order_id)
     logger.info("Message sent to taskiq")
@@ -0,0 +1,75 @@
+"""Модуль накопления элементов в пачки перед отправкой"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class MessageBatcher(Generic[T]):
+    """Накопитель элементов с отправкой пачкой по размеру или по времени.
+
+    Каждый вызов submit ждёт, пока его пачка будет отправлена, поэтому
+    сообщение подтверждается в RMQ только после успешной отправки пачки.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[None]],
+        batch_size: int = 50,
+        max_wait_ms: int = 50,
+    ):
+        self.flush = flush
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> None:
+        """Метод добавления элемента и ожидания отправки его пачки.
+
+        Args:
+            item (T): Элемент пачки
+
+        Raises:
+            Exception: Ошибка отправки пачки
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush_now)
+        await future
+
+    def _flush_now(self) -> None:
+        """Метод запуска отправки накопленной пачки."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._send(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        """Метод отправки пачки и оповещения ожидающих."""
+        try:
+            await self.flush([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    async def close(self) -> None:
+        """Метод отправки накопленного остатка и ожидания всех отправок."""
+        self._flush_now()
+        await asyncio.gather(*self._flushes, return_exceptions=True)
@@ -0,0 +1,31 @@
+"""Модуль идентификаторов заказов.
+
+Повторяет helpers.order_ids сервиса api: идентификатор заказа - UUIDv7,
+created_at заказа равен времени из первых 48 бит id. Условие по created_at
+оставляет в запросах по id только нужные партиции orders.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+__all__ = ["orders_created_at"]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def orders_created_at(order_ids: list[UUID]) -> list[datetime] | None:
+    """
+    Функция получения created_at пачки заказов из идентификаторов.
+
+    Args:
+        order_ids (list[UUID]): Идентификаторы заказов
+
+    Returns:
+        list[datetime] | None: Времена создания, None если хотя бы один
+            идентификатор не UUIDv7 (заказы до перехода на UUIDv7)
+    """
+    if any(order_id.version != 7 for order_id in order_ids):
+        return None
+    return [
+        EPOCH + timedelta(milliseconds=order_id.int >> 80) for order_id in order_ids
+    ]
@@ -0,0 +1,69 @@
+"""Модуль трассировки обработки событий OpenTelemetry"""
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from configs import settings
+
+# До init_tracing трейсер ничего не записывает
+tracer = trace.get_tracer("orders-consumer")
+# Экспортёр в память, если TRACING_EXPORTER=memory (для проверок и бенчмарков)
+memory_exporter: InMemorySpanExporter | None = None
+_provider: TracerProvider | None = None
+
+
+def make_exporter() -> SpanExporter:
+    """Функция создания экспортёра span по TRACING_EXPORTER."""
+    global memory_exporter
+    if settings.TRACING_EXPORTER == "memory":
+        memory_exporter = InMemorySpanExporter()
+        return memory_exporter
+    if settings.TRACING_EXPORTER == "console":
+        return ConsoleSpanExporter()
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+        OTLPSpanExporter,
+    )
+
+    return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+
+def init_tracing(service_name: str, exporter: SpanExporter | None = None) -> None:
+    """
+    Функция включения трассировки процесса.
+
+    Args:
+        service_name (str): Название сервиса в span (консюмер или воркер)
+        exporter (SpanExporter | None): Свой экспортёр, по умолчанию
+            по TRACING_EXPORTER
+    """
+    global _provider
+    if not settings.TRACING_ENABLED or _provider is not None:
+        return
+    exporter = exporter or make_exporter()
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(
+        SimpleSpanProcessor(exporter)
+        if isinstance(exporter, InMemorySpanExporter)
+        else BatchSpanProcessor(exporter)
+    )
+    trace.set_tracer_provider(_provider)
+
+
+def shutdown_tracing() -> None:
+    """Функция отправки накопленных span и остановки трассировки."""
+    if _provider is not None:
+        _provider.shutdown()
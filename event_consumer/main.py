@@ -1,8 +1,12 @@
 """Основной метод вызова приложения"""
 from faststream.asgi import AsgiFastStream, make_ping_asgi
 
-from faststream_core.broker import broker
+from configs import settings
+from database.connection import engine
+from faststream_core.broker import broker, order_batcher
+from helpers.tracing import init_tracing, shutdown_tracing
 from taskiq_core.broker import broker as taskiq_broker
+from taskiq_core.processing import order_processor
 
 app = AsgiFastStream(
     broker,
@@ -13,9 +17,18 @@ app = AsgiFastStream(
 )
 
 
+@app.on_startup
+async def tracing_start():
+    """Метод включения трассировки до подключения к брокеру."""
+    init_tracing(settings.TRACING_SERVICE_NAME)
+
+
 @app.after_startup
 async def taskiq_broker_start():
-    """Метод для подключения taskiq worker после старта FastStream"""
+    """Метод для подключения taskiq worker после старта FastStream.
+    В режиме inline заказы обрабатываются в консюмере и taskiq не нужен."""
+    if settings.CONSUMER_EXECUTION_MODE == "inline":
+        return
     if not taskiq_broker.is_worker_process:
         await taskiq_broker.startup()
 
@@ -23,5 +36,10 @@ async def taskiq_broker_start():
 @app.after_shutdown
 async def taskiq_broker_stop():
     """Метода отключения taskiq worker после отключения FastStream"""
-    if taskiq_broker.is_worker_process:
+    await order_batcher.close()
+    if settings.CONSUMER_EXECUTION_MODE == "inline":
+        await order_processor.close()
+        await engine.dispose()
+    elif not taskiq_broker.is_worker_process:
         await taskiq_broker.shutdown()
+    shutdown_tracing()
@@ -1,7 +1,12 @@
 """Модуль работы с RMQ брокером TaskIQ"""
 
+from taskiq.middlewares.opentelemetry_middleware import OpenTelemetryMiddleware
 from taskiq_aio_pika.broker import AioPikaBroker
 
 from configs import settings
 
-broker = AioPikaBroker(url=settings.RMQ_URL)
+# qos ограничивает количество задач, одновременно выданных воркеру
+broker = AioPikaBroker(url=settings.RMQ_URL, qos=settings.TASKIQ_PREFETCH_COUNT)
+if settings.TRACING_ENABLED:
+    # Контекст trace уходит в метках задачи и продолжается в воркере
+    broker.add_middlewares(OpenTelemetryMiddleware())
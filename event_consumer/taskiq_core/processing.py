@@ -0,0 +1,102 @@
+"""Модуль обработки заказов воркером"""
+
+import asyncio
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from configs import settings
+from database.connection import async_session_maker
+from database.query import get_pending_orders, set_orders_status
+from helpers.batcher import MessageBatcher
+from helpers.enums import OrderStatus
+
+if TYPE_CHECKING:
+    from sqlalchemy import Row
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class OrderProcessor:
+    """Обработчик заказов, ожидающих оплаты.
+
+    Заказы пачки читаются одним SELECT, затем каждый проходит оплату
+    с ограничением одновременных обращений к платёжному шлюзу. Итоговые
+    статусы копятся в общем накопителе и записываются set-based UPDATE
+    на каждый статус. Вызов process завершается только после записи
+    статусов, поэтому сообщение подтверждается уже после коммита.
+    """
+
+    def __init__(
+        self,
+        session_maker: "async_sessionmaker[AsyncSession]",
+        concurrency: int = 50,
+        payment_latency_ms: int = 20,
+        flush_size: int = 200,
+        flush_interval_ms: int = 50,
+    ):
+        self.session_maker = session_maker
+        self.payment_latency = payment_latency_ms / 1000
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.writer: MessageBatcher[tuple[UUID, OrderStatus]] = MessageBatcher(
+            self._write, batch_size=flush_size, max_wait_ms=flush_interval_ms
+        )
+
+    async def process(self, order_ids: list[str]) -> dict[str, int]:
+        """Метод обработки пачки заказов.
+
+        Args:
+            order_ids (list[str]): Идентификаторы заказов
+
+        Returns:
+            dict[str, int]: Количество заказов по итоговым статусам
+        """
+        async with self.session_maker() as session:
+            rows = await get_pending_orders(session, [UUID(i) for i in order_ids])
+        statuses = await asyncio.gather(*(self._process_one(row) for row in rows))
+        return dict(Counter(status.value for status in statuses))
+
+    async def _process_one(self, order: "Row") -> OrderStatus:
+        """Метод оплаты заказа и постановки его статуса в очередь записи."""
+        async with self._semaphore:
+            status = await self.settle(order)
+        await self.writer.submit((order.id, status))
+        return status
+
+    async def settle(self, order: "Row") -> OrderStatus:
+        """Метод проведения оплаты заказа.
+
+        Обращение к платёжному шлюзу эмулируется задержкой PAYMENT_LATENCY_MS.
+
+        Args:
+            order (Row): Строка заказа (id, items, total_price)
+
+        Returns:
+            OrderStatus: PAID, либо CANCELED для пустого или бесплатного заказа
+        """
+        await asyncio.sleep(self.payment_latency)
+        if not order.items or order.total_price <= 0:
+            return OrderStatus.CANCELED
+        return OrderStatus.PAID
+
+    async def _write(self, batch: list[tuple[UUID, OrderStatus]]) -> None:
+        """Метод записи пачки статусов: один UPDATE на статус, одна транзакция."""
+        grouped: dict[OrderStatus, list[UUID]] = defaultdict(list)
+        for order_id, status in batch:
+            grouped[status].append(order_id)
+        async with self.session_maker() as session:
+            for status, ids in grouped.items():
+                await set_orders_status(session, status, ids)
+            await session.commit()
+
+    async def close(self) -> None:
+        """Метод записи статусов, оставшихся в накопителе."""
+        await self.writer.close()
+
+
+order_processor = OrderProcessor(
+    async_session_maker,
+    concurrency=settings.PROCESSING_CONCURRENCY,
+    payment_latency_ms=settings.PAYMENT_LATENCY_MS,
+    flush_size=settings.STATUS_FLUSH_SIZE,
+    flush_interval_ms=settings.STATUS_FLUSH_INTERVAL_MS,
+)
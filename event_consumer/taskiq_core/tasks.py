@@ -1,12 +1,37 @@
 """Модуль описания фоновых задач"""
 
-import asyncio
+from taskiq import TaskiqEvents, TaskiqState
+
+from configs import settings
+from database.connection import engine
+from helpers.tracing import init_tracing, shutdown_tracing
 
 from .broker import broker
+from .processing import order_processor
+
+
+@broker.on_event(TaskiqEvents.WORKER_STARTUP)
+async def startup(state: TaskiqState) -> None:
+    """Включение трассировки в процессе воркера."""
+    init_tracing(f"{settings.TRACING_SERVICE_NAME}-worker")
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def shutdown(state: TaskiqState) -> None:
+    """Запись накопленных статусов, закрытие пула соединений с БД и отправка
+    накопленных span."""
+    await order_processor.close()
+    await engine.dispose()
+    shutdown_tracing()
 
 
 @broker.task
-async def process_order(order_id: str) -> None:
+async def process_order(order_id: str) -> dict[str, int]:
     """Таска работы с приходящим заказом."""
-    await asyncio.sleep(2)
-    print(f"Order {order_id} processed")
+    return await order_processor.process([order_id])
+
+
+@broker.task
+async def process_orders(order_ids: list[str]) -> dict[str, int]:
+    """Таска работы с пачкой приходящих заказов."""
+    return await order_processor.process(order_ids)